@@ -0,0 +1,81 @@
+"""Writes the standalone validator modules for the check-json schemas.
+
+The modules are committed, so CI imports them instead of compiling the schemas. Rerun this (the pre-commit hook
+does) whenever a schema changes or fastjsonschema is upgraded; until then the checker sees the stale header and
+compiles at runtime.
+"""
+
+import argparse
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Optional, Sequence
+
+import fastjsonschema
+from schema_store import SCHEMA_DIR, VENDORED_SCHEMAS, SchemaStore, vendored_store
+
+GENERATED_DIR = SCHEMA_DIR / "generated"
+HASH_HEADER = "# schema-sha256: "
+VERSION_HEADER = "# fastjsonschema-version: "
+ENTRY_POINT_RE = re.compile(r"^def (validate_\w+)\(", re.MULTILINE)
+
+
+def generated_path(schema_path: str) -> Path:
+    """Returns the path of the generated validator module for a schema"""
+    return GENERATED_DIR / f"{Path(schema_path).stem}_validator.py"
+
+
+def read_header(module_path: Path, header: str) -> Optional[str]:
+    """Returns the value of one header line of a generated module"""
+    try:
+        with open(module_path, "r") as f:
+            for line in f:
+                if line.startswith(header):
+                    return line[len(header) :].strip()
+                if not line.startswith("#"):
+                    break
+    except FileNotFoundError:
+        pass
+    return None
+
+
+def is_current(module_path: Path, digest: str) -> bool:
+    """Returns whether a generated module was built from this schema by the installed fastjsonschema"""
+    return (
+        read_header(module_path, HASH_HEADER) == digest and read_header(module_path, VERSION_HEADER) == fastjsonschema.VERSION
+    )
+
+
+def build(schema_path: Path, store: SchemaStore) -> Path:
+    """Compiles a schema to Python source and writes it next to a header recording the schema hash"""
+    raw = schema_path.read_bytes()
+    code = fastjsonschema.compile_to_code(json.loads(raw), handlers=store.handlers())
+    match = ENTRY_POINT_RE.search(code)
+    if not match:
+        raise Exception(f"could not find the validator entry point for {schema_path}")
+
+    out_path = generated_path(str(schema_path))
+    out_path.parent.mkdir(exist_ok=True)
+    with open(out_path, "w") as f:
+        f.write(f"# Generated by build_validators.py from {schema_path.name}, do not edit.\n")
+        f.write(f"{HASH_HEADER}{hashlib.sha256(raw).hexdigest()}\n")
+        f.write(f"{VERSION_HEADER}{fastjsonschema.VERSION}\n")
+        f.write(code)
+        f.write(f"\n\nvalidate = {match.group(1)}\n")
+    return out_path
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--offline", action="store_true", help="fail on any $ref outside the vendored schemas")
+    args = parser.parse_args(argv)
+    store = vendored_store(offline=args.offline)
+    for schema_name in VENDORED_SCHEMAS:
+        out_path = build(SCHEMA_DIR / schema_name, store)
+        print(f"Generated {out_path.relative_to(SCHEMA_DIR)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
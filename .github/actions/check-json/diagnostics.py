@@ -0,0 +1,259 @@
+"""Typed diagnostics computed from schema errors and the document, rather than parsed out of error messages"""
+
+import json
+import re
+from typing import Any, Callable, Dict, FrozenSet, List, NamedTuple, Optional, Pattern, Sequence, Tuple, Union
+
+from json_positions import to_pointer
+
+Path = Tuple[Union[str, int], ...]
+
+FORMATS = {"uri": re.compile(r"^\w+:(\/?\/?)[^\s]+\Z")}
+JSON_TYPES: Dict[str, Callable[[Any], bool]] = {
+    "array": lambda value: isinstance(value, list),
+    "boolean": lambda value: isinstance(value, bool),
+    # Since draft-06 a float without a fractional part is an integer, as fastjsonschema checks it
+    "integer": lambda value: (isinstance(value, int) and not isinstance(value, bool))
+    or (isinstance(value, float) and value.is_integer()),
+    "null": lambda value: value is None,
+    "number": lambda value: isinstance(value, (int, float)) and not isinstance(value, bool),
+    "object": lambda value: isinstance(value, dict),
+    "string": lambda value: isinstance(value, str),
+}
+DRAFT4_JSON_TYPES: Dict[str, Callable[[Any], bool]] = {
+    **JSON_TYPES,
+    "integer": lambda value: isinstance(value, int) and not isinstance(value, bool),
+}
+
+
+class Diagnostic(NamedTuple):
+    rule: str
+    pointer: str
+    keys: Tuple[str, ...]
+    message: str
+    level: str
+
+
+class ObjectRules(NamedTuple):
+    """The members an object schema accepts: named properties, property patterns, and whether others are allowed"""
+
+    properties: FrozenSet[str]
+    patterns: Tuple[Pattern[str], ...]
+    additional: bool
+
+    def disallowed(self, keys: Sequence[str]) -> List[str]:
+        if self.additional:
+            return []
+        return [
+            key for key in keys if key not in self.properties and not any(pattern.search(key) for pattern in self.patterns)
+        ]
+
+
+class SchemaIndex:
+    """Per-schema lookup of the object rules that apply at each document path, resolved once per path"""
+
+    def __init__(self, schema: Dict[str, Any]) -> None:
+        self.schema = schema
+        self.types = DRAFT4_JSON_TYPES if "draft-04" in str(schema.get("$schema", "")) else JSON_TYPES
+        self._resolved: Dict[int, Dict[str, Any]] = {}
+        self._patterns: Dict[str, Pattern[str]] = {}
+        self._schema_rules: Dict[int, ObjectRules] = {}
+        self._rules: Dict[Path, Optional[ObjectRules]] = {(): self.rules_for(schema)}
+
+    def resolve_ref(self, subschema: Dict[str, Any]) -> Dict[str, Any]:
+        """Merges a local `$ref` into the subschema that declares it, returning the same dict on every call"""
+        ref = subschema.get("$ref")
+        if not isinstance(ref, str) or not ref.startswith("#/"):
+            return subschema
+        if id(subschema) not in self._resolved:
+            target: Any = self.schema
+            for part in ref[2:].split("/"):
+                target = target[part.replace("~1", "/").replace("~0", "~")]
+            merged = {key: value for key, value in subschema.items() if key != "$ref"}
+            merged.update(self.resolve_ref(target))
+            self._resolved[id(subschema)] = merged
+        return self._resolved[id(subschema)]
+
+    def pattern(self, pattern: str) -> Pattern[str]:
+        if pattern not in self._patterns:
+            self._patterns[pattern] = re.compile(pattern)
+        return self._patterns[pattern]
+
+    def subschema(self, path: Path) -> Optional[Dict[str, Any]]:
+        """Returns the subschema that applies to the document member at path"""
+        current: Optional[Dict[str, Any]] = self.resolve_ref(self.schema)
+        for part in path:
+            if current is None:
+                return None
+            current = self.child(current, part)
+        return current
+
+    def child(self, subschema: Dict[str, Any], part: Union[str, int]) -> Optional[Dict[str, Any]]:
+        """Returns the subschema that applies to one member key or array index of a subschema's instance"""
+        child: Any = None
+        if isinstance(part, int):
+            child = subschema.get("items")
+        elif part in subschema.get("properties", {}):
+            child = subschema["properties"][part]
+        else:
+            for pattern, pattern_schema in subschema.get("patternProperties", {}).items():
+                if self.pattern(pattern).search(part):
+                    child = pattern_schema
+                    break
+            else:
+                additional = subschema.get("additionalProperties")
+                child = additional if isinstance(additional, dict) else None
+        return self.resolve_ref(child) if isinstance(child, dict) else None
+
+    def rules_for(self, subschema: Optional[Dict[str, Any]]) -> Optional[ObjectRules]:
+        if subschema is None:
+            return None
+        subschema = self.resolve_ref(subschema)
+        if id(subschema) not in self._schema_rules:
+            self._schema_rules[id(subschema)] = ObjectRules(
+                properties=frozenset(subschema.get("properties", {})),
+                patterns=tuple(self.pattern(pattern) for pattern in subschema.get("patternProperties", {})),
+                additional=subschema.get("additionalProperties", True) is not False,
+            )
+        return self._schema_rules[id(subschema)]
+
+    def object_rules(self, path: Path) -> Optional[ObjectRules]:
+        if path not in self._rules:
+            self._rules[path] = self.rules_for(self.subschema(path))
+        return self._rules[path]
+
+
+def document_path(document: Any, parts: Sequence[str]) -> Path:
+    """Maps fastjsonschema's dotted error path onto the document's real keys and indexes.
+
+    The error path is split on `.`, `[` and `]`, so keys that contain those characters are rejoined by matching
+    against the keys the document actually has.
+    """
+    path: List[Union[str, int]] = []
+    current = document
+    i = 0
+    while i < len(parts):
+        if isinstance(current, list) and parts[i].isdigit() and int(parts[i]) < len(current):
+            path.append(int(parts[i]))
+            current = current[int(parts[i])]
+            i += 1
+            continue
+        if not isinstance(current, dict):
+            break
+        for j in range(len(parts), i, -1):
+            key = ".".join(parts[i:j])
+            if key in current:
+                path.append(key)
+                current = current[key]
+                i = j
+                break
+        else:
+            break
+    return tuple(path)
+
+
+def enrich(error: Any, document: Any, index: SchemaIndex) -> List[Diagnostic]:
+    """Turns a fastjsonschema error into diagnostics, one per offending key for disallowed properties"""
+    path = document_path(document, error.path[1:])
+    if error.rule == "additionalProperties" and not error.rule_definition:
+        member: Any = document
+        for part in path:
+            member = member[part]
+        rules = index.object_rules(path)
+        keys = rules.disallowed(list(member)) if rules is not None and isinstance(member, dict) else []
+        if not keys:
+            return [Diagnostic(rule=error.rule, pointer=to_pointer(path), keys=(), message=error.message, level="error")]
+        return [
+            Diagnostic(
+                rule=error.rule,
+                pointer=to_pointer((*path, key)),
+                keys=(key,),
+                message=f"{error.name} must not contain {{{key!r}}} properties",
+                level="error",
+            )
+            for key in sorted(keys)
+        ]
+    return [Diagnostic(rule=error.rule, pointer=to_pointer(path), keys=(), message=error.message, level="warning")]
+
+
+def merge(collected: List[Diagnostic], enriched: List[Diagnostic]) -> List[Diagnostic]:
+    """Returns the collected diagnostics plus those from fastjsonschema's own error at a pointer and rule not yet seen.
+
+    collect() covers only the keywords the vendored schemas use, so the violation fastjsonschema found is always kept.
+    """
+    seen = {(diagnostic.pointer, diagnostic.rule) for diagnostic in collected}
+    return [*collected, *(diagnostic for diagnostic in enriched if (diagnostic.pointer, diagnostic.rule) not in seen)]
+
+
+def collect(document: Any, index: SchemaIndex) -> List[Diagnostic]:
+    """Walks the document against its schema once and returns every violation, not just the first.
+
+    Covers the draft-07 keywords the vendored schemas use; fastjsonschema stays the fast path for valid files.
+    """
+    collector = _Collector(index)
+    collector.check(index.schema, document, (), "data")
+    return collector.diagnostics
+
+
+class _Collector:
+    def __init__(self, index: SchemaIndex) -> None:
+        self.index = index
+        self.diagnostics: List[Diagnostic] = []
+
+    def report(self, rule: str, path: Path, message: str) -> None:
+        self.diagnostics.append(Diagnostic(rule=rule, pointer=to_pointer(path), keys=(), message=message, level="warning"))
+
+    def check(self, schema: Dict[str, Any], value: Any, path: Path, name: str) -> None:
+        schema = self.index.resolve_ref(schema)
+        expected = schema.get("type")
+        if expected is not None:
+            types = [expected] if isinstance(expected, str) else list(expected)
+            if not any(self.index.types[json_type](value) for json_type in types):
+                self.report("type", path, f"{name} must be {' or '.join(types)}")
+                return
+        if "enum" in schema and value not in schema["enum"]:
+            self.report("enum", path, f"{name} must be one of {schema['enum']}")
+
+        if isinstance(value, str):
+            self.check_string(schema, value, path, name)
+        elif isinstance(value, list):
+            self.check_array(schema, value, path, name)
+        elif isinstance(value, dict):
+            self.check_object(schema, value, path, name)
+
+    def check_string(self, schema: Dict[str, Any], value: str, path: Path, name: str) -> None:
+        if "pattern" in schema and not self.index.pattern(schema["pattern"]).search(value):
+            self.report("pattern", path, f"{name} must match pattern {schema['pattern']}")
+        format_re = FORMATS.get(schema.get("format", ""))
+        if format_re is not None and not format_re.match(value):
+            self.report("format", path, f"{name} must be {schema['format']}")
+
+    def check_array(self, schema: Dict[str, Any], value: List[Any], path: Path, name: str) -> None:
+        if "minItems" in schema and len(value) < schema["minItems"]:
+            self.report("minItems", path, f"{name} must contain at least {schema['minItems']} items")
+        if "maxItems" in schema and len(value) > schema["maxItems"]:
+            self.report("maxItems", path, f"{name} must contain less than or equal to {schema['maxItems']} items")
+        if schema.get("uniqueItems") and len({json.dumps(item, sort_keys=True) for item in value}) < len(value):
+            self.report("uniqueItems", path, f"{name} must contain unique items")
+        if isinstance(schema.get("items"), dict):
+            for i, item in enumerate(value):
+                self.check(schema["items"], item, (*path, i), f"{name}[{i}]")
+
+    def check_object(self, schema: Dict[str, Any], value: Dict[str, Any], path: Path, name: str) -> None:
+        rules = self.index.rules_for(schema)
+        disallowed = set(rules.disallowed(list(value))) if rules is not None else set()
+        for key, member in value.items():
+            if key in disallowed:
+                self.diagnostics.append(
+                    Diagnostic(
+                        rule="additionalProperties",
+                        pointer=to_pointer((*path, key)),
+                        keys=(key,),
+                        message=f"{name} must not contain {{{key!r}}} properties",
+                        level="error",
+                    )
+                )
+                continue
+            child = self.index.child(schema, key)
+            if child is not None:
+                self.check(child, member, (*path, key), f"{name}.{key}")
@@ -0,0 +1,160 @@
+# Generated by build_validators.py from cog.json, do not edit.
+# schema-sha256: 721b9aa33bb16e116a13c37f9fc43f8c982b6624fe3a60104f6ea71db5f1b470
+# fastjsonschema-version: 2.19.1
+VERSION = "2.19.1"
+from decimal import Decimal
+import re
+from fastjsonschema import JsonSchemaValueException
+
+
+REGEX_PATTERNS = {
+    '^(0|[1-9][0-9]*)\\.(0|[1-9][0-9]*)\\.(0|[1-9][0-9]*)((a|b|rc)(0|[1-9][0-9]*))?(\\.post(0|[1-9][0-9]*))?(\\.dev(0|[1-9][0-9]*))?$': re.compile('^(0|[1-9][0-9]*)\\.(0|[1-9][0-9]*)\\.(0|[1-9][0-9]*)((a|b|rc)(0|[1-9][0-9]*))?(\\.post(0|[1-9][0-9]*))?(\\.dev(0|[1-9][0-9]*))?\\Z'),
+    '.+': re.compile('.+'),
+    'uri_re_pattern': re.compile('^\\w+:(\\/?\\/?)[^\\s]+\\Z')
+}
+
+NoneType = type(None)
+
+def validate_https___raw_githubusercontent_com_cog_creators_red_discordbot_v3_develop_schema_red_cog_schema_json(data, custom_formats={}, name_prefix=None):
+    if not isinstance(data, (dict)):
+        raise JsonSchemaValueException("" + (name_prefix or "data") + " must be object", value=data, name="" + (name_prefix or "data") + "", definition={'$id': 'https://raw.githubusercontent.com/Cog-Creators/Red-DiscordBot/V3/develop/schema/red_cog.schema.json', '$schema': 'http://json-schema.org/draft-07/schema#', 'title': 'Red-DiscordBot Сog metadata file', 'type': 'object', 'properties': {'author': {'type': 'array', 'description': 'List of names of authors of the cog', 'items': {'type': 'string'}}, 'name': {'type': 'string', 'description': 'The name of the cog'}, 'description': {'type': 'string', 'description': 'A long description of the cog or repo. For cogs, this is displayed when a user executes [p]cog info.'}, 'install_msg': {'type': 'string', 'description': 'The message that gets displayed when a cog is installed or a repo is added'}, 'short': {'type': 'string', 'description': 'A short description of the cog or repo. For cogs, this info is displayed when a user executes [p]cog list'}, 'end_user_data_statement': {'type': 'string', 'description': 'A statement explaining what end user data the cog is storing. This is displayed when a user executes [p]cog info. If the statement has changed since last update, user will be informed during the update.'}, 'min_bot_version': {'type': 'string', 'description': 'Min version number of Red in the format MAJOR.MINOR.MICRO', 'pattern': '^(0|[1-9][0-9]*)\\.(0|[1-9][0-9]*)\\.(0|[1-9][0-9]*)((a|b|rc)(0|[1-9][0-9]*))?(\\.post(0|[1-9][0-9]*))?(\\.dev(0|[1-9][0-9]*))?$'}, 'max_bot_version': {'type': 'string', 'description': 'Max version number of Red in the format MAJOR.MINOR.MICRO, if min_bot_version is newer than max_bot_version, max_bot_version will be ignored', 'pattern': '^(0|[1-9][0-9]*)\\.(0|[1-9][0-9]*)\\.(0|[1-9][0-9]*)((a|b|rc)(0|[1-9][0-9]*))?(\\.post(0|[1-9][0-9]*))?(\\.dev(0|[1-9][0-9]*))?$'}, 'min_python_version': {'type': 'array', 'description': 'Min version number of Python in the format [MAJOR, MINOR, PATCH]', 'minItems': 3, 'maxItems': 3, 'items': {'type': 'integer'}}, 'hidden': {'type': 'boolean', 'description': 'Determines if a cog is visible in the cog list for a repo.'}, 'disabled': {'type': 'boolean', 'description': 'Determines if a cog is available for install.'}, 'required_cogs': {'type': 'object', 'patternProperties': {'.+': {'type': 'string', 'format': 'uri'}}, 'additionalProperties': False}, 'requirements': {'type': 'array', 'description': 'List of required libraries that are passed to pip on cog install.', 'items': {'type': 'string'}}, 'tags': {'type': 'array', 'description': 'A list of strings that are related to the functionality of the cog. Used to aid in searching.', 'uniqueItems': True, 'items': {'type': 'string'}}, 'type': {'type': 'string', 'description': 'Optional, defaults to COG. Must be either COG or SHARED_LIBRARY. If SHARED_LIBRARY then hidden will be True.', 'enum': ['COG', 'SHARED_LIBRARY']}}, 'definitions': {'required_cog': {'type': 'object', 'patternProperties': {'.+': {'type': 'string', 'format': 'uri'}}, 'additionalProperties': False}}, 'additionalProperties': False}, rule='type')
+    data_is_dict = isinstance(data, dict)
+    if data_is_dict:
+        data_keys = set(data.keys())
+        if "author" in data_keys:
+            data_keys.remove("author")
+            data__author = data["author"]
+            if not isinstance(data__author, (list, tuple)):
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".author must be array", value=data__author, name="" + (name_prefix or "data") + ".author", definition={'type': 'array', 'description': 'List of names of authors of the cog', 'items': {'type': 'string'}}, rule='type')
+            data__author_is_list = isinstance(data__author, (list, tuple))
+            if data__author_is_list:
+                data__author_len = len(data__author)
+                for data__author_x, data__author_item in enumerate(data__author):
+                    if not isinstance(data__author_item, (str)):
+                        raise JsonSchemaValueException("" + (name_prefix or "data") + ".author[{data__author_x}]".format(**locals()) + " must be string", value=data__author_item, name="" + (name_prefix or "data") + ".author[{data__author_x}]".format(**locals()) + "", definition={'type': 'string'}, rule='type')
+        if "name" in data_keys:
+            data_keys.remove("name")
+            data__name = data["name"]
+            if not isinstance(data__name, (str)):
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".name must be string", value=data__name, name="" + (name_prefix or "data") + ".name", definition={'type': 'string', 'description': 'The name of the cog'}, rule='type')
+        if "description" in data_keys:
+            data_keys.remove("description")
+            data__description = data["description"]
+            if not isinstance(data__description, (str)):
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".description must be string", value=data__description, name="" + (name_prefix or "data") + ".description", definition={'type': 'string', 'description': 'A long description of the cog or repo. For cogs, this is displayed when a user executes [p]cog info.'}, rule='type')
+        if "install_msg" in data_keys:
+            data_keys.remove("install_msg")
+            data__installmsg = data["install_msg"]
+            if not isinstance(data__installmsg, (str)):
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".install_msg must be string", value=data__installmsg, name="" + (name_prefix or "data") + ".install_msg", definition={'type': 'string', 'description': 'The message that gets displayed when a cog is installed or a repo is added'}, rule='type')
+        if "short" in data_keys:
+            data_keys.remove("short")
+            data__short = data["short"]
+            if not isinstance(data__short, (str)):
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".short must be string", value=data__short, name="" + (name_prefix or "data") + ".short", definition={'type': 'string', 'description': 'A short description of the cog or repo. For cogs, this info is displayed when a user executes [p]cog list'}, rule='type')
+        if "end_user_data_statement" in data_keys:
+            data_keys.remove("end_user_data_statement")
+            data__enduserdatastatement = data["end_user_data_statement"]
+            if not isinstance(data__enduserdatastatement, (str)):
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".end_user_data_statement must be string", value=data__enduserdatastatement, name="" + (name_prefix or "data") + ".end_user_data_statement", definition={'type': 'string', 'description': 'A statement explaining what end user data the cog is storing. This is displayed when a user executes [p]cog info. If the statement has changed since last update, user will be informed during the update.'}, rule='type')
+        if "min_bot_version" in data_keys:
+            data_keys.remove("min_bot_version")
+            data__minbotversion = data["min_bot_version"]
+            if not isinstance(data__minbotversion, (str)):
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".min_bot_version must be string", value=data__minbotversion, name="" + (name_prefix or "data") + ".min_bot_version", definition={'type': 'string', 'description': 'Min version number of Red in the format MAJOR.MINOR.MICRO', 'pattern': '^(0|[1-9][0-9]*)\\.(0|[1-9][0-9]*)\\.(0|[1-9][0-9]*)((a|b|rc)(0|[1-9][0-9]*))?(\\.post(0|[1-9][0-9]*))?(\\.dev(0|[1-9][0-9]*))?$'}, rule='type')
+            if isinstance(data__minbotversion, str):
+                if not REGEX_PATTERNS['^(0|[1-9][0-9]*)\\.(0|[1-9][0-9]*)\\.(0|[1-9][0-9]*)((a|b|rc)(0|[1-9][0-9]*))?(\\.post(0|[1-9][0-9]*))?(\\.dev(0|[1-9][0-9]*))?$'].search(data__minbotversion):
+                    raise JsonSchemaValueException("" + (name_prefix or "data") + ".min_bot_version must match pattern ^(0|[1-9][0-9]*)\\.(0|[1-9][0-9]*)\\.(0|[1-9][0-9]*)((a|b|rc)(0|[1-9][0-9]*))?(\\.post(0|[1-9][0-9]*))?(\\.dev(0|[1-9][0-9]*))?$", value=data__minbotversion, name="" + (name_prefix or "data") + ".min_bot_version", definition={'type': 'string', 'description': 'Min version number of Red in the format MAJOR.MINOR.MICRO', 'pattern': '^(0|[1-9][0-9]*)\\.(0|[1-9][0-9]*)\\.(0|[1-9][0-9]*)((a|b|rc)(0|[1-9][0-9]*))?(\\.post(0|[1-9][0-9]*))?(\\.dev(0|[1-9][0-9]*))?$'}, rule='pattern')
+        if "max_bot_version" in data_keys:
+            data_keys.remove("max_bot_version")
+            data__maxbotversion = data["max_bot_version"]
+            if not isinstance(data__maxbotversion, (str)):
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".max_bot_version must be string", value=data__maxbotversion, name="" + (name_prefix or "data") + ".max_bot_version", definition={'type': 'string', 'description': 'Max version number of Red in the format MAJOR.MINOR.MICRO, if min_bot_version is newer than max_bot_version, max_bot_version will be ignored', 'pattern': '^(0|[1-9][0-9]*)\\.(0|[1-9][0-9]*)\\.(0|[1-9][0-9]*)((a|b|rc)(0|[1-9][0-9]*))?(\\.post(0|[1-9][0-9]*))?(\\.dev(0|[1-9][0-9]*))?$'}, rule='type')
+            if isinstance(data__maxbotversion, str):
+                if not REGEX_PATTERNS['^(0|[1-9][0-9]*)\\.(0|[1-9][0-9]*)\\.(0|[1-9][0-9]*)((a|b|rc)(0|[1-9][0-9]*))?(\\.post(0|[1-9][0-9]*))?(\\.dev(0|[1-9][0-9]*))?$'].search(data__maxbotversion):
+                    raise JsonSchemaValueException("" + (name_prefix or "data") + ".max_bot_version must match pattern ^(0|[1-9][0-9]*)\\.(0|[1-9][0-9]*)\\.(0|[1-9][0-9]*)((a|b|rc)(0|[1-9][0-9]*))?(\\.post(0|[1-9][0-9]*))?(\\.dev(0|[1-9][0-9]*))?$", value=data__maxbotversion, name="" + (name_prefix or "data") + ".max_bot_version", definition={'type': 'string', 'description': 'Max version number of Red in the format MAJOR.MINOR.MICRO, if min_bot_version is newer than max_bot_version, max_bot_version will be ignored', 'pattern': '^(0|[1-9][0-9]*)\\.(0|[1-9][0-9]*)\\.(0|[1-9][0-9]*)((a|b|rc)(0|[1-9][0-9]*))?(\\.post(0|[1-9][0-9]*))?(\\.dev(0|[1-9][0-9]*))?$'}, rule='pattern')
+        if "min_python_version" in data_keys:
+            data_keys.remove("min_python_version")
+            data__minpythonversion = data["min_python_version"]
+            if not isinstance(data__minpythonversion, (list, tuple)):
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".min_python_version must be array", value=data__minpythonversion, name="" + (name_prefix or "data") + ".min_python_version", definition={'type': 'array', 'description': 'Min version number of Python in the format [MAJOR, MINOR, PATCH]', 'minItems': 3, 'maxItems': 3, 'items': {'type': 'integer'}}, rule='type')
+            data__minpythonversion_is_list = isinstance(data__minpythonversion, (list, tuple))
+            if data__minpythonversion_is_list:
+                data__minpythonversion_len = len(data__minpythonversion)
+                if data__minpythonversion_len < 3:
+                    raise JsonSchemaValueException("" + (name_prefix or "data") + ".min_python_version must contain at least 3 items", value=data__minpythonversion, name="" + (name_prefix or "data") + ".min_python_version", definition={'type': 'array', 'description': 'Min version number of Python in the format [MAJOR, MINOR, PATCH]', 'minItems': 3, 'maxItems': 3, 'items': {'type': 'integer'}}, rule='minItems')
+                if data__minpythonversion_len > 3:
+                    raise JsonSchemaValueException("" + (name_prefix or "data") + ".min_python_version must contain less than or equal to 3 items", value=data__minpythonversion, name="" + (name_prefix or "data") + ".min_python_version", definition={'type': 'array', 'description': 'Min version number of Python in the format [MAJOR, MINOR, PATCH]', 'minItems': 3, 'maxItems': 3, 'items': {'type': 'integer'}}, rule='maxItems')
+                for data__minpythonversion_x, data__minpythonversion_item in enumerate(data__minpythonversion):
+                    if not isinstance(data__minpythonversion_item, (int)) and not (isinstance(data__minpythonversion_item, float) and data__minpythonversion_item.is_integer()) or isinstance(data__minpythonversion_item, bool):
+                        raise JsonSchemaValueException("" + (name_prefix or "data") + ".min_python_version[{data__minpythonversion_x}]".format(**locals()) + " must be integer", value=data__minpythonversion_item, name="" + (name_prefix or "data") + ".min_python_version[{data__minpythonversion_x}]".format(**locals()) + "", definition={'type': 'integer'}, rule='type')
+        if "hidden" in data_keys:
+            data_keys.remove("hidden")
+            data__hidden = data["hidden"]
+            if not isinstance(data__hidden, (bool)):
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".hidden must be boolean", value=data__hidden, name="" + (name_prefix or "data") + ".hidden", definition={'type': 'boolean', 'description': 'Determines if a cog is visible in the cog list for a repo.'}, rule='type')
+        if "disabled" in data_keys:
+            data_keys.remove("disabled")
+            data__disabled = data["disabled"]
+            if not isinstance(data__disabled, (bool)):
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".disabled must be boolean", value=data__disabled, name="" + (name_prefix or "data") + ".disabled", definition={'type': 'boolean', 'description': 'Determines if a cog is available for install.'}, rule='type')
+        if "required_cogs" in data_keys:
+            data_keys.remove("required_cogs")
+            data__requiredcogs = data["required_cogs"]
+            validate_https___raw_githubusercontent_com_cog_creators_red_discordbot_v3_develop_schema_red_cog_schema_json__definitions_required_cog(data__requiredcogs, custom_formats, (name_prefix or "data") + ".required_cogs")
+        if "requirements" in data_keys:
+            data_keys.remove("requirements")
+            data__requirements = data["requirements"]
+            if not isinstance(data__requirements, (list, tuple)):
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".requirements must be array", value=data__requirements, name="" + (name_prefix or "data") + ".requirements", definition={'type': 'array', 'description': 'List of required libraries that are passed to pip on cog install.', 'items': {'type': 'string'}}, rule='type')
+            data__requirements_is_list = isinstance(data__requirements, (list, tuple))
+            if data__requirements_is_list:
+                data__requirements_len = len(data__requirements)
+                for data__requirements_x, data__requirements_item in enumerate(data__requirements):
+                    if not isinstance(data__requirements_item, (str)):
+                        raise JsonSchemaValueException("" + (name_prefix or "data") + ".requirements[{data__requirements_x}]".format(**locals()) + " must be string", value=data__requirements_item, name="" + (name_prefix or "data") + ".requirements[{data__requirements_x}]".format(**locals()) + "", definition={'type': 'string'}, rule='type')
+        if "tags" in data_keys:
+            data_keys.remove("tags")
+            data__tags = data["tags"]
+            if not isinstance(data__tags, (list, tuple)):
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".tags must be array", value=data__tags, name="" + (name_prefix or "data") + ".tags", definition={'type': 'array', 'description': 'A list of strings that are related to the functionality of the cog. Used to aid in searching.', 'uniqueItems': True, 'items': {'type': 'string'}}, rule='type')
+            data__tags_is_list = isinstance(data__tags, (list, tuple))
+            if data__tags_is_list:
+                def fn(var): return frozenset(dict((k, fn(v)) for k, v in var.items()).items()) if hasattr(var, "items") else tuple(fn(v) for v in var) if isinstance(var, (dict, list)) else str(var) if isinstance(var, bool) else var
+                data__tags_len = len(data__tags)
+                if data__tags_len > len(set(fn(data__tags_x) for data__tags_x in data__tags)):
+                    raise JsonSchemaValueException("" + (name_prefix or "data") + ".tags must contain unique items", value=data__tags, name="" + (name_prefix or "data") + ".tags", definition={'type': 'array', 'description': 'A list of strings that are related to the functionality of the cog. Used to aid in searching.', 'uniqueItems': True, 'items': {'type': 'string'}}, rule='uniqueItems')
+                for data__tags_x, data__tags_item in enumerate(data__tags):
+                    if not isinstance(data__tags_item, (str)):
+                        raise JsonSchemaValueException("" + (name_prefix or "data") + ".tags[{data__tags_x}]".format(**locals()) + " must be string", value=data__tags_item, name="" + (name_prefix or "data") + ".tags[{data__tags_x}]".format(**locals()) + "", definition={'type': 'string'}, rule='type')
+        if "type" in data_keys:
+            data_keys.remove("type")
+            data__type = data["type"]
+            if not isinstance(data__type, (str)):
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".type must be string", value=data__type, name="" + (name_prefix or "data") + ".type", definition={'type': 'string', 'description': 'Optional, defaults to COG. Must be either COG or SHARED_LIBRARY. If SHARED_LIBRARY then hidden will be True.', 'enum': ['COG', 'SHARED_LIBRARY']}, rule='type')
+            if data__type not in ['COG', 'SHARED_LIBRARY']:
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".type must be one of ['COG', 'SHARED_LIBRARY']", value=data__type, name="" + (name_prefix or "data") + ".type", definition={'type': 'string', 'description': 'Optional, defaults to COG. Must be either COG or SHARED_LIBRARY. If SHARED_LIBRARY then hidden will be True.', 'enum': ['COG', 'SHARED_LIBRARY']}, rule='enum')
+        if data_keys:
+            raise JsonSchemaValueException("" + (name_prefix or "data") + " must not contain "+str(data_keys)+" properties", value=data, name="" + (name_prefix or "data") + "", definition={'$id': 'https://raw.githubusercontent.com/Cog-Creators/Red-DiscordBot/V3/develop/schema/red_cog.schema.json', '$schema': 'http://json-schema.org/draft-07/schema#', 'title': 'Red-DiscordBot Сog metadata file', 'type': 'object', 'properties': {'author': {'type': 'array', 'description': 'List of names of authors of the cog', 'items': {'type': 'string'}}, 'name': {'type': 'string', 'description': 'The name of the cog'}, 'description': {'type': 'string', 'description': 'A long description of the cog or repo. For cogs, this is displayed when a user executes [p]cog info.'}, 'install_msg': {'type': 'string', 'description': 'The message that gets displayed when a cog is installed or a repo is added'}, 'short': {'type': 'string', 'description': 'A short description of the cog or repo. For cogs, this info is displayed when a user executes [p]cog list'}, 'end_user_data_statement': {'type': 'string', 'description': 'A statement explaining what end user data the cog is storing. This is displayed when a user executes [p]cog info. If the statement has changed since last update, user will be informed during the update.'}, 'min_bot_version': {'type': 'string', 'description': 'Min version number of Red in the format MAJOR.MINOR.MICRO', 'pattern': '^(0|[1-9][0-9]*)\\.(0|[1-9][0-9]*)\\.(0|[1-9][0-9]*)((a|b|rc)(0|[1-9][0-9]*))?(\\.post(0|[1-9][0-9]*))?(\\.dev(0|[1-9][0-9]*))?$'}, 'max_bot_version': {'type': 'string', 'description': 'Max version number of Red in the format MAJOR.MINOR.MICRO, if min_bot_version is newer than max_bot_version, max_bot_version will be ignored', 'pattern': '^(0|[1-9][0-9]*)\\.(0|[1-9][0-9]*)\\.(0|[1-9][0-9]*)((a|b|rc)(0|[1-9][0-9]*))?(\\.post(0|[1-9][0-9]*))?(\\.dev(0|[1-9][0-9]*))?$'}, 'min_python_version': {'type': 'array', 'description': 'Min version number of Python in the format [MAJOR, MINOR, PATCH]', 'minItems': 3, 'maxItems': 3, 'items': {'type': 'integer'}}, 'hidden': {'type': 'boolean', 'description': 'Determines if a cog is visible in the cog list for a repo.'}, 'disabled': {'type': 'boolean', 'description': 'Determines if a cog is available for install.'}, 'required_cogs': {'type': 'object', 'patternProperties': {'.+': {'type': 'string', 'format': 'uri'}}, 'additionalProperties': False}, 'requirements': {'type': 'array', 'description': 'List of required libraries that are passed to pip on cog install.', 'items': {'type': 'string'}}, 'tags': {'type': 'array', 'description': 'A list of strings that are related to the functionality of the cog. Used to aid in searching.', 'uniqueItems': True, 'items': {'type': 'string'}}, 'type': {'type': 'string', 'description': 'Optional, defaults to COG. Must be either COG or SHARED_LIBRARY. If SHARED_LIBRARY then hidden will be True.', 'enum': ['COG', 'SHARED_LIBRARY']}}, 'definitions': {'required_cog': {'type': 'object', 'patternProperties': {'.+': {'type': 'string', 'format': 'uri'}}, 'additionalProperties': False}}, 'additionalProperties': False}, rule='additionalProperties')
+    return data
+
+def validate_https___raw_githubusercontent_com_cog_creators_red_discordbot_v3_develop_schema_red_cog_schema_json__definitions_required_cog(data, custom_formats={}, name_prefix=None):
+    if not isinstance(data, (dict)):
+        raise JsonSchemaValueException("" + (name_prefix or "data") + " must be object", value=data, name="" + (name_prefix or "data") + "", definition={'type': 'object', 'patternProperties': {'.+': {'type': 'string', 'format': 'uri'}}, 'additionalProperties': False}, rule='type')
+    data_is_dict = isinstance(data, dict)
+    if data_is_dict:
+        data_keys = set(data.keys())
+        for data_key, data_val in data.items():
+            if REGEX_PATTERNS['.+'].search(data_key):
+                if data_key in data_keys:
+                    data_keys.remove(data_key)
+                if not isinstance(data_val, (str)):
+                    raise JsonSchemaValueException("" + (name_prefix or "data") + ".{data_key}".format(**locals()) + " must be string", value=data_val, name="" + (name_prefix or "data") + ".{data_key}".format(**locals()) + "", definition={'type': 'string', 'format': 'uri'}, rule='type')
+                if isinstance(data_val, str):
+                    if not REGEX_PATTERNS["uri_re_pattern"].match(data_val):
+                        raise JsonSchemaValueException("" + (name_prefix or "data") + ".{data_key}".format(**locals()) + " must be uri", value=data_val, name="" + (name_prefix or "data") + ".{data_key}".format(**locals()) + "", definition={'type': 'string', 'format': 'uri'}, rule='format')
+        if data_keys:
+            raise JsonSchemaValueException("" + (name_prefix or "data") + " must not contain "+str(data_keys)+" properties", value=data, name="" + (name_prefix or "data") + "", definition={'type': 'object', 'patternProperties': {'.+': {'type': 'string', 'format': 'uri'}}, 'additionalProperties': False}, rule='additionalProperties')
+    return data
+
+validate = validate_https___raw_githubusercontent_com_cog_creators_red_discordbot_v3_develop_schema_red_cog_schema_json
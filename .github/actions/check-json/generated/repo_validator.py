@@ -0,0 +1,47 @@
+# Generated by build_validators.py from repo.json, do not edit.
+# schema-sha256: 1b89b7ea9b635ebc849d897315035f1126d0ec48732f3526e5314d61733fd8ee
+# fastjsonschema-version: 2.19.1
+VERSION = "2.19.1"
+from decimal import Decimal
+from fastjsonschema import JsonSchemaValueException
+
+
+NoneType = type(None)
+
+def validate_https___raw_githubusercontent_com_cog_creators_red_discordbot_v3_develop_schema_red_cog_repo_schema_json(data, custom_formats={}, name_prefix=None):
+    if not isinstance(data, (dict)):
+        raise JsonSchemaValueException("" + (name_prefix or "data") + " must be object", value=data, name="" + (name_prefix or "data") + "", definition={'$id': 'https://raw.githubusercontent.com/Cog-Creators/Red-DiscordBot/V3/develop/schema/red_cog_repo.schema.json', '$schema': 'http://json-schema.org/draft-07/schema#', 'title': 'Red-DiscordBot Сog Repo metadata file', 'type': 'object', 'properties': {'author': {'type': 'array', 'description': 'List of names of authors of the cog', 'items': {'type': 'string'}}, 'description': {'type': 'string', 'description': 'A long description of the cog or repo. For cogs, this is displayed when a user executes [p]cog info.'}, 'install_msg': {'type': 'string', 'description': 'The message that gets displayed when a cog is installed or a repo is added'}, 'short': {'type': 'string', 'description': 'A short description of the cog or repo. For cogs, this info is displayed when a user executes [p]cog list'}}, 'additionalProperties': False}, rule='type')
+    data_is_dict = isinstance(data, dict)
+    if data_is_dict:
+        data_keys = set(data.keys())
+        if "author" in data_keys:
+            data_keys.remove("author")
+            data__author = data["author"]
+            if not isinstance(data__author, (list, tuple)):
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".author must be array", value=data__author, name="" + (name_prefix or "data") + ".author", definition={'type': 'array', 'description': 'List of names of authors of the cog', 'items': {'type': 'string'}}, rule='type')
+            data__author_is_list = isinstance(data__author, (list, tuple))
+            if data__author_is_list:
+                data__author_len = len(data__author)
+                for data__author_x, data__author_item in enumerate(data__author):
+                    if not isinstance(data__author_item, (str)):
+                        raise JsonSchemaValueException("" + (name_prefix or "data") + ".author[{data__author_x}]".format(**locals()) + " must be string", value=data__author_item, name="" + (name_prefix or "data") + ".author[{data__author_x}]".format(**locals()) + "", definition={'type': 'string'}, rule='type')
+        if "description" in data_keys:
+            data_keys.remove("description")
+            data__description = data["description"]
+            if not isinstance(data__description, (str)):
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".description must be string", value=data__description, name="" + (name_prefix or "data") + ".description", definition={'type': 'string', 'description': 'A long description of the cog or repo. For cogs, this is displayed when a user executes [p]cog info.'}, rule='type')
+        if "install_msg" in data_keys:
+            data_keys.remove("install_msg")
+            data__installmsg = data["install_msg"]
+            if not isinstance(data__installmsg, (str)):
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".install_msg must be string", value=data__installmsg, name="" + (name_prefix or "data") + ".install_msg", definition={'type': 'string', 'description': 'The message that gets displayed when a cog is installed or a repo is added'}, rule='type')
+        if "short" in data_keys:
+            data_keys.remove("short")
+            data__short = data["short"]
+            if not isinstance(data__short, (str)):
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".short must be string", value=data__short, name="" + (name_prefix or "data") + ".short", definition={'type': 'string', 'description': 'A short description of the cog or repo. For cogs, this info is displayed when a user executes [p]cog list'}, rule='type')
+        if data_keys:
+            raise JsonSchemaValueException("" + (name_prefix or "data") + " must not contain "+str(data_keys)+" properties", value=data, name="" + (name_prefix or "data") + "", definition={'$id': 'https://raw.githubusercontent.com/Cog-Creators/Red-DiscordBot/V3/develop/schema/red_cog_repo.schema.json', '$schema': 'http://json-schema.org/draft-07/schema#', 'title': 'Red-DiscordBot Сog Repo metadata file', 'type': 'object', 'properties': {'author': {'type': 'array', 'description': 'List of names of authors of the cog', 'items': {'type': 'string'}}, 'description': {'type': 'string', 'description': 'A long description of the cog or repo. For cogs, this is displayed when a user executes [p]cog info.'}, 'install_msg': {'type': 'string', 'description': 'The message that gets displayed when a cog is installed or a repo is added'}, 'short': {'type': 'string', 'description': 'A short description of the cog or repo. For cogs, this info is displayed when a user executes [p]cog list'}}, 'additionalProperties': False}, rule='additionalProperties')
+    return data
+
+validate = validate_https___raw_githubusercontent_com_cog_creators_red_discordbot_v3_develop_schema_red_cog_repo_schema_json
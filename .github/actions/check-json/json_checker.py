@@ -1,84 +1,425 @@
+import argparse
+import copy
+import hashlib
+import importlib.util
 import json
-import re
-from glob import glob
-from typing import List, Tuple, Union
+import os
+import subprocess
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
 
 import fastjsonschema
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
 
-def format_output(*, level: str, file: str, line: int, col: int, message: str) -> str:
-    return "::{level} file={file},line={line},col={col}::{message}".format(
-        level=level,
-        file=file,
-        line=line,
-        col=col,
-        message=message
-    )
+from build_validators import generated_path, is_current
+from cog_metadata import LIMITS, MetadataTooLarge, load, release, set_limits
+from diagnostics import SchemaIndex, collect, enrich, merge
+from json_positions import PositionIndex, index_positions
+from memprofile import MEMORY
+from metrics import METRICS
+from profiling import profiled
+from pyproject import PYPROJECT_PATH
+from reporting import DEFAULT_MAX_ANNOTATIONS, Finding, GitHubWriter, JUnitWriter, Reporter, SarifWriter, Writer
+from result_cache import DEFAULT_CACHE_PATH, ResultCache
+from routing import RoutesError, SchemaRouter, load_routes, parse_routes
+from schema_store import SchemaStore, vendored_store
+from tracing import TRACER
+
+Validator = Callable[[Any], Any]
+
+
+class ValidatorRegistry:
+    """Compiles each schema once per process and hands out the compiled validator"""
+
+    def __init__(self, use_generated: bool = True, store: Optional[SchemaStore] = None) -> None:
+        self.use_generated = use_generated
+        self.store = store or vendored_store()
+        self._schemas: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+        self._validators: Dict[Tuple[str, str], Validator] = {}
+        self._indexes: Dict[Tuple[str, str], SchemaIndex] = {}
+        self.hits = 0
+        self.misses = 0
+        self.generated = 0
+
+    def load_schema(self, schema_path: str) -> Tuple[str, Dict[str, Any]]:
+        """Returns the content hash and parsed body of a schema, reading it at most once"""
+        if schema_path not in self._schemas:
+            with open(schema_path, "rb") as f:
+                raw = f.read()
+            self._schemas[schema_path] = (hashlib.sha256(raw).hexdigest(), json.loads(raw))
+            self.store.register(self._schemas[schema_path][1])
+        return self._schemas[schema_path]
+
+    def get(self, schema_path: str) -> Validator:
+        """Returns the compiled validator for a schema, compiling it on first use"""
+        digest, schema = self.load_schema(schema_path)
+        key = (schema_path, digest)
+        validator = self._validators.get(key)
+        if validator is not None:
+            self.hits += 1
+            return validator
+        self.misses += 1
+        validator = self.load_generated(schema_path, digest) if self.use_generated else None
+        if validator is None:
+            # fastjsonschema rewrites parts of the schema it is given, so keep ours pristine for SchemaIndex
+            with TRACER.span("compile schema", schema=schema_path):
+                validator = fastjsonschema.compile(copy.deepcopy(schema), handlers=self.store.handlers())
+        else:
+            self.generated += 1
+        self._validators[key] = validator
+        return validator
+
+    def index(self, schema_path: str) -> SchemaIndex:
+        """Returns the precomputed property index for a schema, used to explain its errors"""
+        digest, schema = self.load_schema(schema_path)
+        key = (schema_path, digest)
+        if key not in self._indexes:
+            self._indexes[key] = SchemaIndex(schema)
+        return self._indexes[key]
+
+    @staticmethod
+    def load_generated(schema_path: str, digest: str) -> Optional[Validator]:
+        """Imports the ahead-of-time validator for a schema if it was generated from the current schema and fastjsonschema"""
+        module_path = generated_path(schema_path)
+        if not is_current(module_path, digest):
+            return None
+        spec = importlib.util.spec_from_file_location(module_path.stem, module_path)
+        if spec is None or spec.loader is None:
+            return None
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        validator: Validator = module.validate
+        return validator
+
+    def drain_stats(self) -> Tuple[int, int, int]:
+        """Returns the hit, miss and pre-generated counts so far and resets them, so each is reported once"""
+        counts = (self.hits, self.misses, self.generated)
+        self.hits = self.misses = self.generated = 0
+        return counts
+
+    def add_stats(self, counts: Tuple[int, int, int]) -> None:
+        """Adds the counts drained from another registry, such as a pool worker's"""
+        self.hits += counts[0]
+        self.misses += counts[1]
+        self.generated += counts[2]
+
+    def stats(self) -> str:
+        return f"Validator cache: {self.hits} hits, {self.misses} misses ({self.generated} pre-generated)"
+
+
+VALIDATORS = ValidatorRegistry()
+
+
+class Result(NamedTuple):
+    filename: str
+    valid: bool
+    findings: List[Finding]
 
 
-def get_json(filename: str) -> Union[dict, list]:
-    """Returns an interpreted json file from a filepath"""
-    with open(filename, "r") as f:
-        return json.load(f)
+def validate(schema_name: str, filename: str) -> Result:
+    """Validates a json file based on a schema, collecting its findings rather than printing them"""
+    with TRACER.span("validate file", file=filename):
+        try:
+            return _validate(schema_name, filename)
+        finally:
+            # Nothing reads a file after its verdict, so don't hold every buffer until the run ends
+            release(filename)
 
 
-def validate(schema_name: str, filename: str) -> bool:
-    """Validates a json file based on a schema"""
+def _validate(schema_name: str, filename: str) -> Result:
     try:
-        schema = get_json(schema_name)
-        json_file = get_json(filename)
-        fastjsonschema.validate(schema, json_file)
-        return True
+        with TRACER.span("load"):
+            metadata = load(filename)
+    except MetadataTooLarge as error:
+        return Result(filename, False, [Finding(filename, 1, 1, "error", "fileSize", str(error))])
+    except OSError as error:
+        # An explicitly named file can be missing or unreadable; that is a finding about it, not a crash
+        return Result(
+            filename, False, [Finding(filename, 1, 1, "error", "fileRead", f"Cannot read {filename}: {error.strerror}")]
+        )
+    with TRACER.span("parse"):
+        metadata.parse()
+    if metadata.error is not None:
+        decode_error = metadata.error
+        finding = Finding(filename, decode_error.lineno, decode_error.colno, "error", "json", decode_error.msg)
+        return Result(filename, False, [finding])
+    validator = VALIDATORS.get(schema_name)
+    try:
+        with TRACER.span("schema validation"):
+            validator(metadata.data)
+        return Result(filename, True, [])
     except fastjsonschema.exceptions.JsonSchemaValueException as error:
-        print(error)
-
-        if error.rule == "additionalProperties" and not error.rule_definition:
-            error_keys, msg_bounds = list_from_str(error.message)
-            for key in error_keys:
-                line, col = get_key_pos(filename, key)
-                message = f"{error.message[:msg_bounds[0] + 1]}{key}{error.message[msg_bounds[1] - 1:]}"
-                print(format_output(level="error", file=filename, line=line, col=col, message=message))
+        # fastjsonschema stops at the first violation, so collect the rest in one walk of the document
+        with TRACER.span("collect errors"):
+            index = VALIDATORS.index(schema_name)
+            diagnostics = merge(collect(metadata.data, index), enrich(error, metadata.data, index))
+        with TRACER.span("locate errors", errors=len(diagnostics)):
+            try:
+                positions = index_positions(metadata.buffer)
+            except ValueError:
+                # A locator that disagrees with the parser should cost positions, not the whole run
+                positions = PositionIndex()
+            findings = []
+            for diagnostic in diagnostics:
+                line, col = get_key_pos(positions, diagnostic.pointer)
+                findings.append(Finding(filename, line, col, diagnostic.level, diagnostic.rule, diagnostic.message))
+        return Result(filename, False, findings)
+
+
+def get_key_pos(positions: PositionIndex, pointer: str) -> Tuple[int, int]:
+    """Returns the position of a key in a json file, falling back to its nearest enclosing key"""
+    return positions.locate(pointer)
+
+
+def init_worker(schema_paths: Sequence[str], max_file_size: int, offline: bool, trace: bool) -> None:
+    """Process pool initializer that compiles every schema before the worker takes any files"""
+    set_limits(max_file_size=max_file_size)
+    VALIDATORS.store.offline = offline
+    TRACER.enabled = trace
+    # Forked workers inherit the parent's events and counts so far; only hand back their own
+    TRACER.drain()
+    VALIDATORS.drain_stats()
+    for schema_path in schema_paths:
+        VALIDATORS.get(schema_path)
+
+
+def validate_task(task: Tuple[str, str]) -> Tuple[Result, List[Dict[str, Any]], Tuple[int, int, int]]:
+    """Validates in a pool worker, handing the worker's trace events and validator counts back with the result"""
+    result = validate(*task)
+    return result, TRACER.drain(), VALIDATORS.drain_stats()
+
+
+def file_size(filename: str) -> int:
+    try:
+        return os.path.getsize(filename)
+    except OSError:
+        return 0
+
+
+def run_tasks(tasks: List[Tuple[str, str]], jobs: int) -> List[Result]:
+    """Validates (schema, filename) pairs, in a process pool when more than one job is allowed"""
+    if not tasks:
+        return []
+    if jobs <= 1 or len(tasks) <= 1:
+        results = [validate(*task) for task in tasks]
+        print(VALIDATORS.stats())
+        return results
+
+    # Workers load their own copies, so the parent's from the cache lookup are no longer needed
+    for _, filename in tasks:
+        release(filename)
+    # Largest files first so a big straggler doesn't start last and hold up the pool
+    tasks = sorted(tasks, key=lambda task: file_size(task[1]), reverse=True)
+    schema_paths = sorted({schema_path for schema_path, _ in tasks})
+    chunksize = max(1, len(tasks) // (jobs * 8))
+    initargs = (schema_paths, LIMITS.max_file_size, VALIDATORS.store.offline, TRACER.enabled)
+    results = []
+    with ProcessPoolExecutor(max_workers=jobs, initializer=init_worker, initargs=initargs) as executor:
+        for result, events, counts in executor.map(validate_task, tasks, chunksize=chunksize):
+            results.append(result)
+            TRACER.events.extend(events)
+            VALIDATORS.add_stats(counts)
+    print(VALIDATORS.stats())
+    return results
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Checks the repo and cog info.json files against the relevant schemas")
+    parser.add_argument("files", nargs="*", help="check only these files, routing each to its schema (default: whole repo)")
+    parser.add_argument(
+        "--no-cache", action="store_true", help="validate every file, ignoring and not updating the result cache"
+    )
+    parser.add_argument(
+        "--cache-path", default=DEFAULT_CACHE_PATH, help=f"result cache location (default: {DEFAULT_CACHE_PATH})"
+    )
+    parser.add_argument(
+        "--changed-since", metavar="REF", help="only check info.json files changed since the merge base with this git ref"
+    )
+    parser.add_argument(
+        "--max-file-size",
+        type=int,
+        default=LIMITS.max_file_size,
+        metavar="BYTES",
+        help=f"fail files larger than this without loading them (default: {LIMITS.max_file_size})",
+    )
+    parser.add_argument("--offline", action="store_true", help="fail on any schema $ref that is not in the local schema store")
+    parser.add_argument("--sarif", metavar="PATH", help="also write the findings as a SARIF 2.1.0 log")
+    parser.add_argument("--junit", metavar="PATH", help="also write the findings as JUnit XML, one test case per file")
+    parser.add_argument(
+        "--max-annotations",
+        type=int,
+        default=DEFAULT_MAX_ANNOTATIONS,
+        metavar="N",
+        help=f"annotate at most N findings per file (default: {DEFAULT_MAX_ANNOTATIONS})",
+    )
+    parser.add_argument("--trace", metavar="PATH", help="write a Chrome trace-event file of every phase and file")
+    parser.add_argument(
+        "--memprofile",
+        metavar="PATH",
+        help="trace allocations and write per-phase memory use as JSON (validates in-process, ignoring --jobs)",
+    )
+    parser.add_argument("--metrics-file", metavar="PATH", help="write file counts, errors and durations as OpenMetrics text")
+    parser.add_argument(
+        "--profile",
+        metavar="PATH",
+        help="run under cProfile, writing pstats to PATH and collapsed stacks beside it (validates in-process)",
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=os.cpu_count() or 1, help="number of validation processes (default: CPU count)"
+    )
+    args = parser.parse_args(argv)
+    if args.files and args.changed_since:
+        parser.error("--changed-since cannot be combined with explicit files")
+    return args
+
+
+def changed_files(ref: str) -> List[str]:
+    """Returns the files changed between the merge base with a git ref and the working tree"""
+    proc = subprocess.run(
+        ["git", "diff", "--name-only", "--no-renames", "--diff-filter=d", "--merge-base", ref],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return [line for line in proc.stdout.splitlines() if line]
+
+
+def base_routes(ref: str) -> Dict[str, str]:
+    """Returns the routes configured at the merge base with a git ref"""
+    base = subprocess.run(["git", "merge-base", ref, "HEAD"], check=True, capture_output=True, text=True).stdout.strip()
+    proc = subprocess.run(["git", "show", f"{base}:{PYPROJECT_PATH}"], check=False, capture_output=True, text=True)
+    # No pyproject.toml at the merge base means the default routes applied
+    return parse_routes(proc.stdout if proc.returncode == 0 else "", f"{PYPROJECT_PATH} at {base}")
+
+
+def discover_tasks(router: SchemaRouter, changed_since: Optional[str] = None) -> List[Tuple[str, str]]:
+    """Returns the (schema, filename) pairs to validate, limited to changed files when given a git ref"""
+    if changed_since is not None:
+        changed = changed_files(changed_since)
+        if not set(changed).isdisjoint(router.schemas):
+            print("Schema changed, checking all files")
+        elif PYPROJECT_PATH in changed and base_routes(changed_since) != router.routes:
+            print("Routes changed, checking all files")
         else:
-            key_name = error.path[1]
-            line, col = get_key_pos(filename, key_name)
-            print(format_output(level="warning", file=filename, line=line, col=col, message=error.message))
-            return False
-
-
-def get_key_pos(filename: str, key: str) -> Tuple[int, int]:
-    """Returns the position of a key in a json file"""
-    reg_match = re.compile(f'"{key}"\\s?:')
-    with open(filename, "r") as f:
-        lines = f.read().split("\n")
-    for i, line in enumerate(lines, start=1):
-        match = reg_match.search(line)
-        if not match:
+            tasks = router.route_files(changed)
+            print(f"Checking {len(tasks)} info.json file(s) changed since {changed_since}")
+            return tasks
+
+    return router.discover()
+
+
+def lookup_cached(
+    tasks: List[Tuple[str, str]], cache: Optional[ResultCache]
+) -> Tuple[List[Result], List[Tuple[str, str]], Dict[str, Tuple[str, str]]]:
+    """Splits tasks into cached results and pending tasks, returning the content and schema hash of each file"""
+    results: List[Result] = []
+    pending: List[Tuple[str, str]] = []
+    hashes: Dict[str, Tuple[str, str]] = {}
+    for schema_path, filename in tasks:
+        if cache is None:
+            pending.append((schema_path, filename))
             continue
-        span = match.span()
-        return i, span[0] + 1
-    raise Exception(f"could not get position of key: {key}")
-
-
-def list_from_str(set_str: str) -> Tuple[List[str], Tuple[int, int]]:
-    """Returns a list from a string representation of a list"""
-    list_reg = re.compile("^.*{(.*)}.*$")
-    match = list_reg.match(set_str)
-    if not match:
-        raise Exception(f"Failed to parse set from string {set_str}")
-    to_list = "[" + match.group(1).replace('"', '\\"').replace("'", '"') + "]"
-    return json.loads(to_list), match.regs[1]
-
-
-def main() -> int:
-    validation_success: List[bool] = []
-    for file_pattern, schema_path in {
-            "info.json": ".github/actions/check-json/repo.json",
-            "*/info.json": ".github/actions/check-json/cog.json"
-    }.items():
-        for filename in glob(file_pattern):
-            validation_success.append(validate(schema_path, filename))
-
-    return int(not all(validation_success))
+        try:
+            content_hash = hashlib.sha256(load(filename).buffer).hexdigest()
+        except (MetadataTooLarge, OSError):
+            pending.append((schema_path, filename))
+            continue
+        hashes[filename] = (content_hash, VALIDATORS.load_schema(schema_path)[0])
+        cached = cache.get(filename, *hashes[filename])
+        if cached is None:
+            pending.append((schema_path, filename))
+        else:
+            release(filename)
+            results.append(Result(filename, *cached))
+    return results, pending, hashes
+
+
+def writers(args: argparse.Namespace) -> List[Writer]:
+    """Returns the GitHub annotation writer plus any report files requested on the command line"""
+    selected: List[Writer] = [GitHubWriter(max_per_file=args.max_annotations)]
+    if args.sarif is not None:
+        selected.append(SarifWriter(args.sarif))
+    if args.junit is not None:
+        selected.append(JUnitWriter(args.junit))
+    return selected
+
+
+def record_metrics(discovered: int, validated: int, results: List[Result]) -> None:
+    help_text = "info.json files by outcome of this run"
+    METRICS.gauge("files", help_text, discovered, state="discovered")
+    METRICS.gauge("files", help_text, validated, state="validated")
+    METRICS.gauge("files", help_text, discovered - validated, state="cached")
+    METRICS.gauge("files", help_text, sum(not result.valid for result in results), state="failed")
+    errors = Counter(finding.rule for result in results for finding in result.findings)
+    for rule, count in sorted(errors.items()):
+        METRICS.gauge("errors", "Errors reported, by the schema rule that failed", count, rule=rule)
+
+
+@contextmanager
+def phase(name: str, **args: Any) -> Iterator[None]:
+    """Traces and times a top-level phase and snapshots memory at its end"""
+    with TRACER.span(name, **args), MEMORY.phase(name), METRICS.phase(name):
+        yield
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    if args.memprofile is not None or args.profile is not None:
+        # tracemalloc and cProfile only see this process, so keep validation out of pool workers
+        args.jobs = 1
+    if args.profile is not None:
+        return profiled(args.profile, run, args)
+    return run(args)
+
+
+def run(args: argparse.Namespace) -> int:
+    TRACER.enabled = args.trace is not None
+    if args.memprofile is not None:
+        MEMORY.start()
+    if args.metrics_file is not None:
+        METRICS.start("tig_cogs_check_json")
+    set_limits(max_file_size=args.max_file_size)
+    VALIDATORS.store.offline = args.offline
+    with phase("discover"):
+        try:
+            router = SchemaRouter(load_routes())
+        except RoutesError as error:
+            print(f"Error: {error}", file=sys.stderr)
+            return 1
+        tasks = router.route_files(args.files) if args.files else discover_tasks(router, args.changed_since)
+
+    cache = None if args.no_cache else ResultCache(args.cache_path)
+    with phase("cache lookup", files=len(tasks)):
+        results, pending, hashes = lookup_cached(tasks, cache)
+
+    with phase("validate", files=len(pending), jobs=args.jobs):
+        for result in run_tasks(pending, args.jobs):
+            if cache is not None and result.filename in hashes:
+                cache.put(result.filename, *hashes[result.filename], result.valid, result.findings)
+            results.append(result)
+        if cache is not None:
+            cache.close()
+
+    with phase("report"):
+        reporter = Reporter(writers(args))
+        for result in results:
+            reporter.add(result.filename, result.findings)
+        reporter.flush()
+        if cache is not None:
+            print(cache.stats())
+
+    if args.trace is not None:
+        TRACER.write(args.trace)
+    if args.memprofile is not None:
+        MEMORY.write(args.memprofile)
+    if args.metrics_file is not None:
+        record_metrics(len(tasks), len(pending), results)
+        METRICS.write(args.metrics_file)
+    return int(not all(result.valid for result in results))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,123 @@
+"""Single-pass index of where every key and value sits in a raw JSON document"""
+
+import codecs
+import json
+import re
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+Position = Tuple[int, int]
+
+TOKEN_RE = re.compile(
+    rb"""
+    (?P<ws>[ \t\r\n]+)
+    | (?P<string>"[^"\\]*(?:\\.[^"\\]*)*")
+    | (?P<punct>[{}\[\]:,])
+    | (?P<literal>-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?|true|false|null|NaN|-?Infinity)
+    """,
+    re.VERBOSE,
+)
+
+
+def to_pointer(path: Sequence[Union[str, int]]) -> str:
+    """Returns the JSON pointer (RFC 6901) for a sequence of keys and indexes"""
+    return "".join("/" + str(part).replace("~", "~0").replace("/", "~1") for part in path)
+
+
+class PositionIndex:
+    """(line, col) of every key and value in a document, keyed by JSON pointer"""
+
+    def __init__(self) -> None:
+        self.keys: Dict[str, Position] = {}
+        self.values: Dict[str, Position] = {}
+
+    def locate(self, pointer: str) -> Position:
+        """Returns the position of a member's key, its value, or failing both its nearest ancestor"""
+        while True:
+            if pointer in self.keys:
+                return self.keys[pointer]
+            if pointer in self.values:
+                return self.values[pointer]
+            if not pointer:
+                return 1, 1
+            pointer = pointer[: pointer.rindex("/")]
+
+
+class _Container:
+    __slots__ = ("is_object", "pointer", "key", "index", "expect_value")
+
+    def __init__(self, is_object: bool, pointer: str) -> None:
+        self.is_object = is_object
+        self.pointer = pointer
+        self.key = ""
+        self.index = 0
+        self.expect_value = not is_object
+
+    def child_pointer(self) -> str:
+        return self.pointer + to_pointer((self.key if self.is_object else self.index,))
+
+
+def index_positions(buf: Union[bytes, memoryview]) -> PositionIndex:
+    """Walks a raw JSON document once and records the position of every key and value.
+
+    Lines and columns are 1-based and columns count characters rather than bytes. Like json.loads, it accepts
+    NaN and Infinity, and it skips a leading UTF-8 BOM.
+    """
+    index = PositionIndex()
+    stack: List[_Container] = []
+    start = len(codecs.BOM_UTF8) if bytes(buf[: len(codecs.BOM_UTF8)]) == codecs.BOM_UTF8 else 0
+    line, line_start, multibyte_extra = 1, start, 0
+    pos, end = start, len(buf)
+
+    while pos < end:
+        match = TOKEN_RE.match(buf, pos)
+        if match is None:
+            raise ValueError(f"unexpected character at line {line}, col {pos - line_start - multibyte_extra + 1}")
+        kind = match.lastgroup
+        token = match.group()
+        position = (line, pos - line_start - multibyte_extra + 1)
+        top = stack[-1] if stack else None
+
+        if kind == "ws":
+            newlines = token.count(b"\n")
+            if newlines:
+                line += newlines
+                line_start = pos + token.rindex(b"\n") + 1
+                multibyte_extra = 0
+        elif kind == "punct":
+            _punctuation(token, position, stack, index)
+        elif top is not None and top.is_object and not top.expect_value:
+            top.key = json.loads(token)
+            index.keys[top.child_pointer()] = position
+        else:
+            index.values[_next_value_pointer(top)] = position
+
+        if kind == "string" and not token.isascii():
+            multibyte_extra += len(token) - len(token.decode("utf-8", "replace"))
+        pos = match.end()
+
+    return index
+
+
+def _punctuation(token: bytes, position: Position, stack: List[_Container], index: PositionIndex) -> None:
+    top = stack[-1] if stack else None
+    if token in b"{[":
+        pointer = _next_value_pointer(top)
+        index.values[pointer] = position
+        stack.append(_Container(token == b"{", pointer))
+    elif token in b"}]":
+        stack.pop()
+    elif top is None:
+        return
+    elif token == b":":
+        top.expect_value = True
+    elif not top.is_object:
+        top.index += 1
+
+
+def _next_value_pointer(top: Optional[_Container]) -> str:
+    if top is None:
+        return ""
+    pointer = top.child_pointer()
+    if top.is_object:
+        top.expect_value = False
+    return pointer
@@ -0,0 +1,127 @@
+"""Typed findings and the writers that report them in one batch: GitHub annotations, SARIF and JUnit XML"""
+
+import json
+import sys
+import xml.etree.ElementTree as ET
+from typing import Dict, List, NamedTuple, Optional, Protocol, Sequence, TextIO
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+TOOL_NAME = "check-json"
+# GitHub shows at most 10 error and 10 warning annotations per step, so more than that per file is noise
+DEFAULT_MAX_ANNOTATIONS = 10
+
+
+class Finding(NamedTuple):
+    file: str
+    line: int
+    col: int
+    level: str
+    rule: str
+    message: str
+
+
+class Writer(Protocol):
+    def write(self, files: Dict[str, List[Finding]]) -> None: ...
+
+
+def format_output(*, level: str, file: str, line: int, col: int, message: str) -> str:
+    return "::{level} file={file},line={line},col={col}::{message}".format(
+        level=level, file=file, line=line, col=col, message=message
+    )
+
+
+class GitHubWriter:
+    """Writes each finding's message followed by its workflow-command annotation, capped per file"""
+
+    def __init__(self, stream: Optional[TextIO] = None, max_per_file: int = DEFAULT_MAX_ANNOTATIONS) -> None:
+        self.stream = stream
+        self.max_per_file = max_per_file
+
+    def write(self, files: Dict[str, List[Finding]]) -> None:
+        lines = []
+        for filename, findings in files.items():
+            for finding in findings[: self.max_per_file]:
+                lines.append(finding.message)
+                lines.append(
+                    format_output(
+                        level=finding.level, file=finding.file, line=finding.line, col=finding.col, message=finding.message
+                    )
+                )
+            if len(findings) > self.max_per_file:
+                lines.append(f"{filename}: {len(findings) - self.max_per_file} more finding(s) not shown")
+        if lines:
+            stream = self.stream or sys.stdout
+            stream.write("\n".join(lines) + "\n")
+            stream.flush()
+
+
+class SarifWriter:
+    """Writes a SARIF 2.1.0 log, e.g. for GitHub code scanning"""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def write(self, files: Dict[str, List[Finding]]) -> None:
+        findings = [finding for file_findings in files.values() for finding in file_findings]
+        rules = sorted({finding.rule for finding in findings})
+        results = [
+            {
+                "ruleId": finding.rule,
+                "ruleIndex": rules.index(finding.rule),
+                "level": "error" if finding.level == "error" else "warning",
+                "message": {"text": finding.message},
+                "locations": [
+                    {
+                        "physicalLocation": {
+                            "artifactLocation": {"uri": finding.file},
+                            "region": {"startLine": finding.line, "startColumn": finding.col},
+                        }
+                    }
+                ],
+            }
+            for finding in findings
+        ]
+        log = {
+            "$schema": SARIF_SCHEMA,
+            "version": "2.1.0",
+            "runs": [{"tool": {"driver": {"name": TOOL_NAME, "rules": [{"id": rule} for rule in rules]}}, "results": results}],
+        }
+        with open(self.path, "w") as f:
+            json.dump(log, f, indent=2)
+
+
+class JUnitWriter:
+    """Writes a JUnit XML report with one test case per checked file"""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def write(self, files: Dict[str, List[Finding]]) -> None:
+        suite = ET.Element("testsuite", name=TOOL_NAME, tests=str(len(files)))
+        failures = 0
+        for filename, findings in files.items():
+            case = ET.SubElement(suite, "testcase", classname=TOOL_NAME, name=filename)
+            if findings:
+                failures += 1
+                failure = ET.SubElement(case, "failure", message=findings[0].message, type=findings[0].rule)
+                failure.text = "\n".join(f"{f.file}:{f.line}:{f.col}: {f.level}: {f.message}" for f in findings)
+        suite.set("failures", str(failures))
+        ET.ElementTree(suite).write(self.path, encoding="utf-8", xml_declaration=True)
+
+
+class Reporter:
+    """Buffers the findings of every file and hands them, deduplicated and sorted, to each writer at once"""
+
+    def __init__(self, writers: Sequence[Writer]) -> None:
+        self.writers = writers
+        self.files: Dict[str, List[Finding]] = {}
+
+    def add(self, filename: str, findings: Sequence[Finding]) -> None:
+        # Identical findings (same position, rule and message) are reported once
+        self.files[filename] = list(dict.fromkeys(findings))
+
+    def flush(self) -> None:
+        files = {filename: self.files[filename] for filename in sorted(self.files)}
+        for writer in self.writers:
+            writer.write(files)
+        self.files = {}
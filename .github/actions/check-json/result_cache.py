@@ -0,0 +1,79 @@
+"""Persistent cache of validation results so unchanged files are not re-validated"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import fastjsonschema
+from reporting import Finding
+
+DEFAULT_CACHE_PATH = ".cache/check-json.db"
+# Bumped whenever the table layout changes; an older table is dropped rather than migrated
+SCHEMA_VERSION = 3
+# Every module under these directories can change a verdict, so all of them feed the checker version
+CHECKER_SOURCE_DIRS = (Path(__file__).resolve().parent, Path(__file__).resolve().parent.parent / "common")
+
+
+def checker_version() -> str:
+    """Returns a hash over the checker's own sources and the fastjsonschema version, so any change invalidates old results"""
+    digest = hashlib.sha256(fastjsonschema.VERSION.encode())
+    for source_dir in CHECKER_SOURCE_DIRS:
+        for path in sorted(source_dir.rglob("*.py")):
+            digest.update(path.relative_to(source_dir).as_posix().encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Stores the verdict and findings of each file keyed by its content hash, schema hash and checker version"""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.version = checker_version()
+        self.hits = 0
+        self.misses = 0
+        self._db = sqlite3.connect(path)
+        if self._db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self._db.execute("DROP TABLE IF EXISTS results")
+            self._db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " filename TEXT PRIMARY KEY,"
+            " content_hash TEXT NOT NULL,"
+            " schema_hash TEXT NOT NULL,"
+            " checker_version TEXT NOT NULL,"
+            " valid INTEGER NOT NULL,"
+            " findings TEXT NOT NULL)"
+        )
+
+    def get(self, filename: str, content_hash: str, schema_hash: str) -> Optional[Tuple[bool, List[Finding]]]:
+        """Returns the stored (valid, findings) for a file, or None if it has changed since it was stored"""
+        row = self._db.execute(
+            "SELECT valid, findings FROM results"
+            " WHERE filename = ? AND content_hash = ? AND schema_hash = ? AND checker_version = ?",
+            (filename, content_hash, schema_hash, self.version),
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        # Findings are stored without the filename, which is the row's key
+        return bool(row[0]), [Finding(filename, *finding) for finding in json.loads(row[1])]
+
+    def put(self, filename: str, content_hash: str, schema_hash: str, valid: bool, findings: List[Finding]) -> None:
+        self._db.execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+            (filename, content_hash, schema_hash, self.version, int(valid), json.dumps([finding[1:] for finding in findings])),
+        )
+
+    def close(self) -> None:
+        self._db.commit()
+        self._db.close()
+
+    def stats(self) -> str:
+        total = self.hits + self.misses
+        rate = self.hits / total * 100 if total else 0.0
+        return f"Result cache: {self.hits} hits, {self.misses} misses ({rate:.1f}% hit rate)"
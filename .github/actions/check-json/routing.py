@@ -0,0 +1,91 @@
+"""Routing of metadata files to the schemas they are checked against"""
+
+import os
+import re
+from pathlib import PurePosixPath
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from cog_metadata import glob_to_regex, walk
+from pyproject import PYPROJECT_PATH, tomllib
+
+CONFIG_TABLE = ("tool", "tig-cogs", "check-json")
+DEFAULT_ROUTES = {
+    "info.json": ".github/actions/check-json/repo.json",
+    "*/info.json": ".github/actions/check-json/cog.json",
+}
+
+
+class RoutesError(Exception):
+    pass
+
+
+def parse_routes(text: str, source: str = PYPROJECT_PATH) -> Dict[str, str]:
+    """Returns the `{pattern: schema}` table from [tool.tig-cogs.check-json.routes] of a pyproject.toml, or the defaults"""
+    if tomllib is None:
+        raise RoutesError(f"reading check-json routes from {source} needs tomli on Python < 3.11")
+    try:
+        config: Any = tomllib.loads(text)
+    except tomllib.TOMLDecodeError as error:
+        raise RoutesError(f"cannot read check-json routes from {source}: {error}") from error
+    for key in CONFIG_TABLE:
+        config = config.get(key, {})
+    routes = config.get("routes")
+    if not routes:
+        return dict(DEFAULT_ROUTES)
+    return {str(pattern): str(schema_path) for pattern, schema_path in routes.items()}
+
+
+def load_routes(pyproject_path: str = PYPROJECT_PATH) -> Dict[str, str]:
+    """Returns the configured routes, or the default routes if there is no pyproject.toml.
+
+    Raises RoutesError if pyproject.toml exists but cannot be read, rather than silently ignoring its routes.
+    """
+    try:
+        with open(pyproject_path, "r", encoding="utf-8") as f:
+            text = f.read()
+    except FileNotFoundError:
+        return dict(DEFAULT_ROUTES)
+    return parse_routes(text, pyproject_path)
+
+
+def repo_relative(filename: str) -> str:
+    """Returns a path relative to the working directory, in the posix form routes and annotations use"""
+    return os.path.relpath(filename).replace(os.sep, "/")
+
+
+class SchemaRouter:
+    """Routes file paths to schemas with one regex compiled from every route's glob pattern"""
+
+    def __init__(self, routes: Dict[str, str]) -> None:
+        self.routes = routes
+        self.schemas = list(routes.values())
+        self._regex = re.compile("|".join(f"(?P<route{i}>{glob_to_regex(pattern)})" for i, pattern in enumerate(routes)))
+        if any("**" in pattern for pattern in routes):
+            self.max_depth: Optional[int] = None
+        else:
+            self.max_depth = max((len(PurePosixPath(pattern).parts) for pattern in routes), default=0)
+
+    def route(self, filename: str) -> Optional[str]:
+        """Returns the schema a file should be validated against, if any"""
+        match = self._regex.fullmatch(PurePosixPath(os.path.normpath(filename)).as_posix())
+        if match is None or match.lastgroup is None:
+            return None
+        return self.schemas[int(match.lastgroup[len("route") :])]
+
+    def route_files(self, filenames: Sequence[str]) -> List[Tuple[str, str]]:
+        """Returns (schema, filename) pairs for the given files, skipping files outside the repo or no route matches.
+
+        Filenames are made relative to the repo root (the working directory) first, so absolute paths route too.
+        """
+        tasks = []
+        for filename in dict.fromkeys(map(repo_relative, filenames)):
+            if filename.startswith("../"):
+                continue
+            schema_path = self.route(filename)
+            if schema_path is not None:
+                tasks.append((schema_path, filename))
+        return tasks
+
+    def discover(self, root: str = ".") -> List[Tuple[str, str]]:
+        """Returns a (schema, filename) pair for every file any route matches, from the shared cog_metadata walk"""
+        return self.route_files(walk(root, self.max_depth))
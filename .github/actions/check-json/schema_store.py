@@ -0,0 +1,67 @@
+"""Local store of JSON schemas by `$id`, so `$ref` resolution never has to touch the network"""
+
+import copy
+import json
+from pathlib import Path
+from typing import Any, Callable, Dict
+from urllib.parse import urldefrag, urlsplit
+from urllib.request import urlopen
+
+from fastjsonschema import JsonSchemaDefinitionException
+
+SCHEMA_DIR = Path(__file__).resolve().parent
+VENDORED_SCHEMAS = ("repo.json", "cog.json")
+FETCH_TIMEOUT = 10
+
+
+class UnresolvableRef(JsonSchemaDefinitionException):  # type: ignore[misc]
+    def __init__(self, uri: str) -> None:
+        super().__init__(f"$ref to {uri} is not in the local schema store and network access is disabled")
+        self.uri = uri
+
+
+def document_uri(uri: str) -> str:
+    """Returns a URI without its fragment, normalized the way fastjsonschema keys its own store"""
+    return urlsplit(urldefrag(uri)[0]).geturl()
+
+
+class SchemaStore:
+    """Schemas keyed by document URI; remote documents fetched in online mode are cached alongside them"""
+
+    def __init__(self, offline: bool = False) -> None:
+        self.offline = offline
+        self.schemas: Dict[str, Dict[str, Any]] = {}
+        self.fetches = 0
+
+    def register(self, schema: Dict[str, Any]) -> None:
+        schema_id = schema.get("$id", schema.get("id"))
+        if isinstance(schema_id, str) and schema_id:
+            self.schemas[document_uri(schema_id)] = schema
+
+    def register_file(self, path: Path) -> None:
+        with open(path, "rb") as f:
+            self.register(json.load(f))
+
+    def resolve(self, uri: str) -> Dict[str, Any]:
+        """Returns the document a `$ref` URI points into, fetching and caching it only when online"""
+        key = document_uri(uri)
+        if key not in self.schemas:
+            if self.offline:
+                raise UnresolvableRef(key)
+            with urlopen(key, timeout=FETCH_TIMEOUT) as response:
+                self.schemas[key] = json.loads(response.read().decode(response.headers.get_content_charset() or "utf-8"))
+            self.fetches += 1
+        # fastjsonschema rewrites the refs of the documents it is given, so hand out copies
+        return copy.deepcopy(self.schemas[key])
+
+    def handlers(self) -> Dict[str, Callable[[str], Dict[str, Any]]]:
+        """Returns fastjsonschema resolver handlers that read from the store instead of urllib"""
+        return {"http": self.resolve, "https": self.resolve}
+
+
+def vendored_store(offline: bool = False) -> SchemaStore:
+    """Returns a store with every schema vendored in this action registered by its `$id`"""
+    store = SchemaStore(offline)
+    for name in VENDORED_SCHEMAS:
+        store.register_file(SCHEMA_DIR / name)
+    return store
@@ -0,0 +1,19 @@
+from pathlib import Path
+
+import fastjsonschema
+from build_validators import HASH_HEADER, VERSION_HEADER, is_current
+
+
+def write_module(path: Path, digest: str, version: str) -> Path:
+    path.write_text(f"# Generated\n{HASH_HEADER}{digest}\n{VERSION_HEADER}{version}\nVERSION = {version!r}\n")
+    return path
+
+
+def test_current_module(tmp_path: Path) -> None:
+    assert is_current(write_module(tmp_path / "m.py", "abc", fastjsonschema.VERSION), "abc")
+
+
+def test_stale_schema_or_fastjsonschema(tmp_path: Path) -> None:
+    assert not is_current(write_module(tmp_path / "m.py", "abc", fastjsonschema.VERSION), "def")
+    assert not is_current(write_module(tmp_path / "m.py", "abc", "0.0.1"), "abc")
+    assert not is_current(tmp_path / "missing.py", "abc")
@@ -0,0 +1,35 @@
+from typing import Any, Dict, List, Tuple
+
+import fastjsonschema
+import pytest
+from diagnostics import SchemaIndex, collect, enrich, merge
+
+
+def diagnose(schema: Dict[str, Any], document: Any) -> List[Tuple[str, str]]:
+    index = SchemaIndex(schema)
+    with pytest.raises(fastjsonschema.JsonSchemaValueException) as error:
+        fastjsonschema.compile(schema)(document)
+    return [
+        (diagnostic.pointer, diagnostic.rule)
+        for diagnostic in merge(collect(document, index), enrich(error.value, document, index))
+    ]
+
+
+def test_keeps_the_violation_collect_does_not_cover() -> None:
+    schema = {"properties": {"a": {"type": "string"}}, "required": ["b"]}
+    assert sorted(diagnose(schema, {"a": 5})) == [("", "required"), ("/a", "type")]
+
+
+def test_does_not_repeat_a_collected_violation() -> None:
+    schema = {"properties": {"a": {"type": "string"}, "b": {"type": "string"}}}
+    assert diagnose(schema, {"a": 5, "b": 6}) == [("/a", "type"), ("/b", "type")]
+
+
+def test_integral_float_is_an_integer_since_draft_06() -> None:
+    schema = {"properties": {"version": {"type": "array", "items": {"type": "integer"}}, "name": {"type": "string"}}}
+    assert diagnose(schema, {"version": [3, 9.0], "name": 1}) == [("/name", "type")]
+
+
+def test_integral_float_is_not_an_integer_in_draft_04() -> None:
+    schema = {"$schema": "http://json-schema.org/draft-04/schema#", "properties": {"count": {"type": "integer"}}}
+    assert diagnose(schema, {"count": 9.0}) == [("/count", "type")]
@@ -0,0 +1,76 @@
+import codecs
+
+import pytest
+from json_positions import index_positions, to_pointer
+
+
+def test_keys_and_values() -> None:
+    index = index_positions(b'{"name": "x",\n  "tags": ["a", "b"]}')
+    assert index.keys["/name"] == (1, 2)
+    assert index.values["/name"] == (1, 10)
+    assert index.keys["/tags"] == (2, 3)
+    assert index.values["/tags/1"] == (2, 17)
+
+
+def test_nested_pointers() -> None:
+    index = index_positions(b'{"a": {"b": [1, {"c": 2}]}}')
+    assert index.values[""] == (1, 1)
+    assert index.keys["/a/b"] == (1, 8)
+    assert index.values["/a/b/1"] == (1, 17)
+    assert index.keys["/a/b/1/c"] == (1, 18)
+    assert index.values["/a/b/1/c"] == (1, 23)
+
+
+def test_pointer_escaping() -> None:
+    index = index_positions(b'{"a/b": {"c~d": 1}}')
+    assert index.keys[to_pointer(("a/b", "c~d"))] == (1, 10)
+    assert to_pointer(("a/b", "c~d")) == "/a~1b/c~0d"
+
+
+def test_escaped_strings() -> None:
+    index = index_positions(b'{"q\\"k": "\\\\", "u\\u00e9": 1, "n": 2}')
+    assert index.keys['/q"k'] == (1, 2)
+    assert index.keys["/ué"] == (1, 16)
+    assert index.keys["/n"] == (1, 30)
+
+
+def test_non_ascii_columns_count_characters() -> None:
+    index = index_positions('{"été": "☃", "b": 1}'.encode())
+    assert index.keys["/b"] == (1, 14)
+
+
+def test_non_ascii_resets_on_new_line() -> None:
+    index = index_positions('{"☃": 1,\n "b": 2}'.encode())
+    assert index.keys["/b"] == (2, 2)
+
+
+def test_leading_bom_is_skipped() -> None:
+    document = b'{"a": 1,\n "b": 2}'
+    plain = index_positions(document)
+    with_bom = index_positions(codecs.BOM_UTF8 + document)
+    assert with_bom.keys == plain.keys
+    assert with_bom.values == plain.values
+    assert with_bom.keys["/a"] == (1, 2)
+
+
+def test_non_finite_literals() -> None:
+    index = index_positions(b'{"a": NaN, "b": Infinity, "c": [-Infinity, 1]}')
+    assert index.values["/a"] == (1, 7)
+    assert index.values["/b"] == (1, 17)
+    assert index.values["/c/0"] == (1, 33)
+    assert index.values["/c/1"] == (1, 44)
+
+
+def test_memoryview_input() -> None:
+    assert index_positions(memoryview(b'[0, {"k": true}]')).keys["/1/k"] == (1, 6)
+
+
+def test_locate_falls_back_to_ancestor() -> None:
+    index = index_positions(b'{"a": {"b": 1}}')
+    assert index.locate("/a/missing") == (1, 2)
+    assert index.locate("/missing") == (1, 1)
+
+
+def test_unexpected_character() -> None:
+    with pytest.raises(ValueError, match="line 2, col 3"):
+        index_positions(b'{"a":\n  undefined}')
@@ -0,0 +1,38 @@
+import os
+
+import pytest
+import routing
+from routing import DEFAULT_ROUTES, RoutesError, SchemaRouter, load_routes, parse_routes
+
+
+def test_routes_absolute_and_dotted_paths_relative_to_the_repo_root(monkeypatch: pytest.MonkeyPatch, tmp_path: str) -> None:
+    monkeypatch.chdir(tmp_path)
+    router = SchemaRouter(DEFAULT_ROUTES)
+    tasks = router.route_files([os.path.join(os.getcwd(), "cog", "info.json"), "./cog/info.json", "info.json"])
+    assert tasks == [(DEFAULT_ROUTES["*/info.json"], "cog/info.json"), (DEFAULT_ROUTES["info.json"], "info.json")]
+
+
+def test_skips_files_outside_the_repo_and_unrouted_files(monkeypatch: pytest.MonkeyPatch, tmp_path: str) -> None:
+    monkeypatch.chdir(tmp_path)
+    assert SchemaRouter(DEFAULT_ROUTES).route_files(["../info.json", "cog/data/info.json", "cog/other.json"]) == []
+
+
+def test_reads_routes_from_pyproject() -> None:
+    text = '[tool.tig-cogs.check-json.routes]\n"*/meta.json" = "meta.json"\n'
+    assert parse_routes(text) == {"*/meta.json": "meta.json"}
+    assert parse_routes("[tool.poetry]\n") == DEFAULT_ROUTES
+
+
+def test_missing_pyproject_uses_default_routes(tmp_path: str) -> None:
+    assert load_routes(os.path.join(tmp_path, "pyproject.toml")) == DEFAULT_ROUTES
+
+
+def test_unreadable_pyproject_fails_loudly(monkeypatch: pytest.MonkeyPatch, tmp_path: str) -> None:
+    pyproject_path = os.path.join(tmp_path, "pyproject.toml")
+    with open(pyproject_path, "w", encoding="utf-8") as f:
+        f.write("[tool\n")
+    with pytest.raises(RoutesError, match="cannot read"):
+        load_routes(pyproject_path)
+    monkeypatch.setattr(routing, "tomllib", None)
+    with pytest.raises(RoutesError, match="needs tomli"):
+        load_routes(pyproject_path)
@@ -0,0 +1,24 @@
+import argparse
+from typing import Optional
+
+import json_checker
+import pytest
+import stress
+from cog_metadata import LIMITS, clear_caches
+
+# Small enough to run with the unit tests; stress.py defaults to 200 KB inputs
+SIZE = 20_000
+
+
+@pytest.mark.parametrize("indent", [None, 2], ids=["one line", "indented"])
+@pytest.mark.parametrize("name", list(stress.CASES))
+def test_stress_case_stays_within_bounds(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: str, name: str, indent: Optional[int]
+) -> None:
+    monkeypatch.setattr(LIMITS, "max_file_size", 64 * SIZE)
+    json_checker.VALIDATORS.get(stress.COG_SCHEMA)
+    args = argparse.Namespace(size=SIZE, max_seconds=2.0, seed=0)
+    try:
+        assert stress.run_case(str(tmp_path), name, indent, args) == []
+    finally:
+        clear_caches()
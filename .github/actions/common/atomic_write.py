@@ -0,0 +1,18 @@
+"""Whole-file writes that readers never observe half done"""
+
+import os
+import tempfile
+
+
+def write_atomic(path: str, text: str, mode: int = 0o644) -> None:
+    """Writes text to a temporary file beside path and renames it into place"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
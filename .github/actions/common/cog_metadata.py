@@ -0,0 +1,222 @@
+"""Discovery and loading of info.json metadata, shared by the CI scripts so each process scans and parses the tree once"""
+
+import codecs
+import json
+import mmap
+import os
+import re
+from typing import Any, Dict, FrozenSet, Iterator, List, Optional, Sequence, Tuple, Union
+
+INFO_FILENAME = "info.json"
+GITIGNORE_PATH = ".gitignore"
+DEFAULT_EXCLUDES = ("__pycache__", "node_modules")
+GLOB_TOKEN_RE = re.compile(r"(\*\*/|\*|\?|\[!?\]?[^\]]*\])")
+
+_walk_cache: Dict[Tuple[str, Optional[int], Tuple[str, ...]], List[str]] = {}
+_metadata_cache: Dict[str, "Metadata"] = {}
+
+
+def glob_to_regex(pattern: str) -> str:
+    """Translates a path glob to a regex where `*`, `?` and `[...]` stay within one path segment and `**/` spans any"""
+    regex = []
+    # Split with a capturing group, so literal text and glob tokens alternate
+    for i, part in enumerate(GLOB_TOKEN_RE.split(pattern)):
+        if i % 2 == 0:
+            regex.append(re.escape(part))
+        elif part.startswith("["):
+            regex.append(class_to_regex(part))
+        else:
+            regex.append({"**/": "(?:[^/]+/)*", "*": "[^/]*", "?": "[^/]"}[part])
+    return "".join(regex)
+
+
+def class_to_regex(part: str) -> str:
+    """Translates a glob character class such as `[cod]`, `[a-z]` or `[!0-9]`; a negated class never matches `/`"""
+    body = part[1:-1]
+    negated = body.startswith(("!", "^"))
+    if negated:
+        body = body[1:]
+    body = body.replace("\\", "\\\\").replace("[", "\\[")
+    if body.startswith("^"):
+        body = "\\" + body
+    return f"[^/{body}]" if negated else f"[{body}]"
+
+
+class IgnoreRules:
+    """The subset of .gitignore syntax the repo uses: globs, root anchors and directory-only patterns.
+
+    Negated (`!`) patterns are not supported and are skipped.
+    """
+
+    def __init__(self, patterns: Sequence[str]) -> None:
+        file_rules: List[str] = []
+        dir_rules: List[str] = []
+        for line in patterns:
+            stripped = line.strip()
+            if not stripped or stripped.startswith(("#", "!")):
+                continue
+            dir_only = stripped.endswith("/")
+            pattern = stripped.rstrip("/")
+            anchored = "/" in pattern
+            regex = glob_to_regex(pattern.lstrip("/"))
+            regex = regex if anchored else f"(?:.*/)?{regex}"
+            (dir_rules if dir_only else file_rules).append(regex)
+        self._file_re = re.compile("|".join(file_rules)) if file_rules else None
+        self._dir_re = re.compile("|".join(file_rules + dir_rules)) if file_rules or dir_rules else None
+
+    @classmethod
+    def from_file(cls, path: str = GITIGNORE_PATH) -> "IgnoreRules":
+        try:
+            with open(path, "r") as f:
+                return cls(f.read().splitlines())
+        except FileNotFoundError:
+            return cls([])
+
+    def ignored(self, path: str, is_dir: bool) -> bool:
+        regex = self._dir_re if is_dir else self._file_re
+        return regex is not None and regex.fullmatch(path) is not None
+
+
+def walk(root: str = ".", max_depth: Optional[int] = None, excludes: Sequence[str] = DEFAULT_EXCLUDES) -> List[str]:
+    """Returns the relative paths of files below root in one scandir walk.
+
+    Hidden entries (like glob()), excluded names and anything matched by root's .gitignore are skipped. Results are
+    memoized, so every caller in the process shares one walk.
+    """
+    key = (os.path.abspath(root), max_depth, tuple(excludes))
+    if key not in _walk_cache:
+        rules = IgnoreRules.from_file(os.path.join(root, GITIGNORE_PATH))
+        _walk_cache[key] = list(_walk(root, "", max_depth, frozenset(excludes), rules))
+    return _walk_cache[key]
+
+
+def _walk(
+    directory: str, prefix: str, max_depth: Optional[int], excludes: FrozenSet[str], rules: IgnoreRules
+) -> Iterator[str]:
+    with os.scandir(directory) as entries:
+        for entry in sorted(entries, key=lambda entry: entry.name):
+            if entry.name.startswith(".") or entry.name in excludes:
+                continue
+            path = prefix + entry.name
+            is_dir = entry.is_dir(follow_symlinks=False)
+            if rules.ignored(path, is_dir):
+                continue
+            if is_dir:
+                if max_depth is None or max_depth > 1:
+                    yield from _walk(entry.path, path + "/", None if max_depth is None else max_depth - 1, excludes, rules)
+            elif entry.is_file():
+                yield path
+
+
+def cog_info_paths(root: str = ".") -> List[str]:
+    """Returns the `*/info.json` paths of every cog"""
+    return [path for path in walk(root, max_depth=2) if path.count("/") == 1 and path.endswith("/" + INFO_FILENAME)]
+
+
+class MetadataTooLarge(Exception):
+    def __init__(self, path: str, size: int, max_size: int) -> None:
+        super().__init__(f"{path} is {size} bytes, larger than the {max_size} byte limit")
+        self.path = path
+        self.size = size
+
+
+class Limits:
+    """Size above which files are refused, and size above which they are memory-mapped rather than read"""
+
+    max_file_size = 1024 * 1024
+    mmap_threshold = 64 * 1024
+
+
+LIMITS = Limits()
+
+
+def set_limits(*, max_file_size: Optional[int] = None, mmap_threshold: Optional[int] = None) -> None:
+    if max_file_size is not None:
+        LIMITS.max_file_size = max_file_size
+    if mmap_threshold is not None:
+        LIMITS.mmap_threshold = mmap_threshold
+
+
+class Metadata:
+    """A metadata file held in one buffer, shared by parsing and position lookups, and parsed at most once"""
+
+    def __init__(self, path: str, buffer: Union[bytes, mmap.mmap]) -> None:
+        self.path = path
+        self._source = buffer
+        view = memoryview(buffer)
+        # The BOM is not part of the document, so neither the parser nor the position index should see it
+        self.buffer = view[len(codecs.BOM_UTF8) :] if view[: len(codecs.BOM_UTF8)] == codecs.BOM_UTF8 else view
+        self._data: Any = None
+        self._error: Optional[json.JSONDecodeError] = None
+        self._parsed = False
+
+    def parse(self) -> None:
+        if not self._parsed:
+            try:
+                self._data = json.loads(str(self.buffer, "utf-8"))
+            except UnicodeDecodeError as error:
+                self._error = json.JSONDecodeError(f"File is not valid UTF-8 ({error.reason})", "", 0)
+            except json.JSONDecodeError as error:
+                self._error = error
+            self._parsed = True
+
+    @property
+    def data(self) -> Any:
+        """The parsed document; raises json.JSONDecodeError if the file is not valid JSON"""
+        self.parse()
+        if self._error is not None:
+            raise self._error
+        return self._data
+
+    @property
+    def error(self) -> Optional[json.JSONDecodeError]:
+        self.parse()
+        return self._error
+
+    def close(self) -> None:
+        """Drops the buffer and parsed document, unmapping the file if it was memory-mapped"""
+        self.buffer.release()
+        if isinstance(self._source, mmap.mmap):
+            self._source.close()
+        self._data = None
+
+
+def load(path: str) -> Metadata:
+    """Returns a metadata file, reading it from disk only the first time it is requested.
+
+    Files above LIMITS.mmap_threshold are memory-mapped instead of read, and files above LIMITS.max_file_size
+    raise MetadataTooLarge before any of their content is loaded.
+    """
+    metadata = _metadata_cache.get(path)
+    if metadata is None:
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size > LIMITS.max_file_size:
+                raise MetadataTooLarge(path, size, LIMITS.max_file_size)
+            if size > LIMITS.mmap_threshold:
+                buffer: Union[bytes, mmap.mmap] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                buffer = f.read()
+        metadata = Metadata(path, buffer)
+        _metadata_cache[path] = metadata
+    return metadata
+
+
+def release(path: str) -> None:
+    """Closes a loaded file and forgets it, for callers that are done with it; a later load reads it again"""
+    metadata = _metadata_cache.pop(path, None)
+    if metadata is not None:
+        metadata.close()
+
+
+def clear_caches() -> None:
+    """Forgets every memoized walk and loaded file, so the next caller scans and reads the tree again"""
+    _walk_cache.clear()
+    for path in list(_metadata_cache):
+        release(path)
+
+
+def load_cogs(root: str = ".") -> Iterator[Metadata]:
+    """Yields the loaded metadata of every cog, loading each only when the caller gets to it"""
+    for path in cog_info_paths(root):
+        yield load(os.path.join(root, path) if root != "." else path)
@@ -0,0 +1,105 @@
+"""Per-phase memory snapshots taken with tracemalloc, reported as JSON"""
+
+import json
+import platform
+import sys
+import tracemalloc
+from typing import Any, Dict, List, Optional
+
+from tracing import NULL_SPAN
+
+if sys.platform != "win32":
+    import resource
+else:
+    resource = None
+
+DEFAULT_TOP = 10
+# Allocations made by the profiler itself and by the import machinery are not interesting per phase
+IGNORED_FILES = ("<frozen importlib._bootstrap>", "<frozen importlib._bootstrap_external>", tracemalloc.__file__, __file__)
+
+
+def peak_rss() -> Optional[int]:
+    """Returns the peak resident set size of this process in bytes, or None where the platform cannot tell"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return int(peak if sys.platform == "darwin" else peak * 1024)
+
+
+class Phase:
+    __slots__ = ("name", "profiler")
+
+    def __init__(self, profiler: "MemoryProfiler", name: str) -> None:
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self) -> "Phase":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.profiler.snapshot(self.name)
+
+
+class MemoryProfiler:
+    """Snapshots traced memory at the end of each phase; the top sites are what the phase allocated and still holds"""
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.top = DEFAULT_TOP
+        self.phases: List[Dict[str, Any]] = []
+        self.previous: Optional[tracemalloc.Snapshot] = None
+
+    def start(self, top: int = DEFAULT_TOP) -> None:
+        self.enabled = True
+        self.top = top
+        tracemalloc.start()
+        self.previous = self.take_snapshot()
+
+    def phase(self, name: str) -> Any:
+        if not self.enabled:
+            return NULL_SPAN
+        return Phase(self, name)
+
+    @staticmethod
+    def take_snapshot() -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, filename) for filename in IGNORED_FILES])
+
+    def snapshot(self, name: str) -> None:
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = self.take_snapshot()
+        assert self.previous is not None
+        top = snapshot.compare_to(self.previous, "lineno")[: self.top]
+        self.phases.append(
+            {
+                "phase": name,
+                "traced_current": current,
+                "traced_peak": peak,
+                "rss_peak": peak_rss(),
+                "top": [
+                    {
+                        "site": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                        "size": stat.size,
+                        "size_diff": stat.size_diff,
+                        "count": stat.count,
+                        "count_diff": stat.count_diff,
+                    }
+                    for stat in top
+                ],
+            }
+        )
+        self.previous = snapshot
+        # Without a reset every later phase would report the peak of the worst earlier one (Python 3.9+)
+        if hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+
+    def write(self, path: str) -> None:
+        """Stops tracing and writes the per-phase report, with stable keys so reports can be diffed across versions"""
+        tracemalloc.stop()
+        report = {"meta": {"python": platform.python_version(), "argv": sys.argv[1:]}, "phases": self.phases}
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+
+MEMORY = MemoryProfiler()
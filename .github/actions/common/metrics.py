@@ -0,0 +1,139 @@
+"""OpenMetrics textfile export of CI run results and phase durations"""
+
+import bisect
+import math
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from atomic_write import write_atomic
+from tracing import NULL_SPAN
+
+# Seconds; the phases of a CI run range from milliseconds on a warm cache to minutes on a cold large repo
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for _, value in labels)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(labels, escaped)) + "}"
+
+
+def format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum")
+
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+
+class Family:
+    """One metric name with its type, help text and a sample per label set"""
+
+    def __init__(self, name: str, kind: str, help_text: str, unit: str = "") -> None:
+        self.name = name
+        self.kind = kind
+        self.help = help_text
+        self.unit = unit
+        self.values: Dict[Labels, float] = {}
+        self.histograms: Dict[Labels, Histogram] = {}
+
+    def render(self) -> List[str]:
+        lines = [f"# TYPE {self.name} {self.kind}", f"# HELP {self.name} {self.help}"]
+        if self.unit:
+            lines.append(f"# UNIT {self.name} {self.unit}")
+        for labels, value in sorted(self.values.items()):
+            lines.append(f"{self.name}{format_labels(labels)} {format_value(value)}")
+        for labels, histogram in sorted(self.histograms.items()):
+            cumulative = 0
+            for bound, count in zip((*histogram.buckets, math.inf), histogram.counts):
+                cumulative += count
+                bucket_labels = (*labels, ("le", format_value(bound)))
+                lines.append(f"{self.name}_bucket{format_labels(bucket_labels)} {cumulative}")
+            lines.append(f"{self.name}_sum{format_labels(labels)} {format_value(histogram.sum)}")
+            lines.append(f"{self.name}_count{format_labels(labels)} {cumulative}")
+        return lines
+
+
+class PhaseTimer:
+    __slots__ = ("name", "registry", "start")
+
+    def __init__(self, registry: "MetricsRegistry", name: str) -> None:
+        self.registry = registry
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self) -> "PhaseTimer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.registry.observe(
+            "phase_duration_seconds",
+            "Wall time of each phase of the run",
+            time.perf_counter() - self.start,
+            unit="seconds",
+            phase=self.name,
+        )
+
+
+class MetricsRegistry:
+    """Collects gauges and histograms for one run; every name is prefixed with the script's namespace"""
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.namespace = ""
+        self.families: Dict[str, Family] = {}
+
+    def start(self, namespace: str) -> None:
+        self.enabled = True
+        self.namespace = namespace
+
+    def family(self, name: str, kind: str, help_text: str, unit: str = "") -> Family:
+        full_name = f"{self.namespace}_{name}"
+        if full_name not in self.families:
+            self.families[full_name] = Family(full_name, kind, help_text, unit)
+        return self.families[full_name]
+
+    def gauge(self, name: str, help_text: str, value: float, **labels: str) -> None:
+        if self.enabled:
+            self.family(name, "gauge", help_text).values[tuple(sorted(labels.items()))] = value
+
+    def observe(
+        self, name: str, help_text: str, value: float, unit: str = "", buckets: Optional[Sequence[float]] = None, **labels: str
+    ) -> None:
+        if not self.enabled:
+            return
+        histograms = self.family(name, "histogram", help_text, unit).histograms
+        key = tuple(sorted(labels.items()))
+        if key not in histograms:
+            histograms[key] = Histogram(buckets or DEFAULT_BUCKETS)
+        histograms[key].observe(value)
+
+    def phase(self, name: str) -> Any:
+        if not self.enabled:
+            return NULL_SPAN
+        return PhaseTimer(self, name)
+
+    def render(self) -> str:
+        lines = [line for _, family in sorted(self.families.items()) for line in family.render()]
+        return "\n".join([*lines, "# EOF"]) + "\n"
+
+    def write(self, path: str) -> None:
+        """Writes the textfile atomically, so a scraper never reads a half-written file"""
+        write_atomic(path, self.render())
+
+
+METRICS = MetricsRegistry()
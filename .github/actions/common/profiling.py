@@ -0,0 +1,89 @@
+"""cProfile runs of the CI scripts, saved as pstats plus collapsed stacks for flamegraph tools"""
+
+import argparse
+import cProfile
+import os
+import pstats
+import sys
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+Function = Tuple[str, int, str]
+DEFAULT_TOP = 25
+# pstats times are in seconds; flamegraph tools want integer sample counts
+UNITS_PER_SECOND = 1_000_000
+
+
+def folded_path(pstats_path: str) -> str:
+    return os.path.splitext(pstats_path)[0] + ".folded"
+
+
+def profiled(path: str, func: Callable[..., T], *args: Any) -> T:
+    """Runs func under cProfile, writing the stats to path and collapsed stacks next to it"""
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(func, *args)
+    finally:
+        profiler.dump_stats(path)
+        with open(folded_path(path), "w") as f:
+            f.writelines(f"{stack} {value}\n" for stack, value in collapse(pstats.Stats(profiler)))
+        print(f"Wrote {path} and {folded_path(path)}", file=sys.stderr)
+
+
+def label(function: Function) -> str:
+    filename, line, name = function
+    if filename == "~":
+        return name
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+
+def collapse(stats: pstats.Stats) -> List[Tuple[str, int]]:
+    """Returns (stack, microseconds) pairs in collapsed-stack format.
+
+    cProfile only records caller/callee edges, so each function's own time is split across its call paths in
+    proportion to the cumulative time of each edge. Recursive edges are cut so every path is finite.
+    """
+    raw: Dict[Function, Any] = stats.stats  # type: ignore[attr-defined]
+    callees: Dict[Function, List[Tuple[Function, float]]] = {}
+    for callee, (_, _, _, _, callers) in raw.items():
+        for caller, (_, _, _, edge_cumtime) in callers.items():
+            callees.setdefault(caller, []).append((callee, edge_cumtime))
+    folded: Dict[str, float] = {}
+
+    def walk(function: Function, path: Tuple[Function, ...], stack: str, share: float) -> None:
+        folded[stack] = folded.get(stack, 0.0) + raw[function][2] * share
+        for callee, edge_cumtime in callees.get(function, ()):
+            callee_cumtime = raw[callee][3]
+            # Paths worth less than one unit would be dropped from the output anyway
+            if callee in path or callee_cumtime <= 0 or share * edge_cumtime * UNITS_PER_SECOND < 1:
+                continue
+            walk(callee, (*path, callee), f"{stack};{label(callee)}", share * edge_cumtime / callee_cumtime)
+
+    for function, (_, _, _, _, callers) in raw.items():
+        if not callers:
+            walk(function, (function,), label(function), 1.0)
+    return sorted(
+        (stack, round(seconds * UNITS_PER_SECOND)) for stack, seconds in folded.items() if seconds * UNITS_PER_SECOND >= 1
+    )
+
+
+def print_hotspots(path: str, top: int = DEFAULT_TOP, restrictions: Sequence[str] = ()) -> None:
+    """Prints the top functions of a saved profile by cumulative time, optionally filtered by regex"""
+    stats = pstats.Stats(path)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(*restrictions, top)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Prints the cumulative hotspots of a --profile run")
+    parser.add_argument("pstats", help="profile written by --profile")
+    parser.add_argument("-n", "--top", type=int, default=DEFAULT_TOP, help=f"rows to print (default: {DEFAULT_TOP})")
+    parser.add_argument(
+        "--filter", action="append", default=[], metavar="REGEX", help="only functions matching this, e.g. get_key_pos"
+    )
+    args = parser.parse_args(argv)
+    print_hotspots(args.pstats, args.top, args.filter)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
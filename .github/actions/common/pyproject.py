@@ -0,0 +1,16 @@
+"""The TOML parser and pyproject.toml location shared by the CI scripts that read it"""
+
+import sys
+
+__all__ = ["PYPROJECT_PATH", "tomllib"]
+
+if sys.version_info >= (3, 11):
+    import tomllib
+else:
+    try:
+        import tomli as tomllib
+    except ImportError:
+        # Callers raise their own error naming what they could not read
+        tomllib = None
+
+PYPROJECT_PATH = "pyproject.toml"
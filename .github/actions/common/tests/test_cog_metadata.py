@@ -0,0 +1,60 @@
+import codecs
+from pathlib import Path
+
+import cog_metadata
+import pytest
+from cog_metadata import IgnoreRules, load, release, set_limits
+
+
+@pytest.mark.parametrize(
+    ("path", "ignored"),
+    [("module.pyc", True), ("cog/module.pyo", True), ("module.pyd", True), ("module.pyx", False), ("module.py", False)],
+)
+def test_character_class(path: str, ignored: bool) -> None:
+    assert IgnoreRules(["*.py[cod]"]).ignored(path, is_dir=False) is ignored
+
+
+def test_negated_character_class() -> None:
+    rules = IgnoreRules(["/build[!0-9]/"])
+    assert rules.ignored("builds", is_dir=True)
+    assert not rules.ignored("build1", is_dir=True)
+    assert not rules.ignored("build/", is_dir=True)
+
+
+def test_unterminated_bracket_is_literal() -> None:
+    rules = IgnoreRules(["[abc"])
+    assert rules.ignored("[abc", is_dir=False)
+    assert not rules.ignored("a", is_dir=False)
+
+
+@pytest.mark.parametrize("mmap_threshold", [0, 1024 * 1024])
+def test_release_closes_and_forgets(tmp_path: Path, mmap_threshold: int) -> None:
+    path = tmp_path / "info.json"
+    path.write_text('{"name": "cog"}')
+    previous = cog_metadata.LIMITS.mmap_threshold
+    set_limits(mmap_threshold=mmap_threshold)
+    try:
+        metadata = load(str(path))
+        assert metadata.data == {"name": "cog"}
+        release(str(path))
+        with pytest.raises(ValueError):
+            bytes(metadata.buffer)
+        assert load(str(path)) is not metadata
+    finally:
+        release(str(path))
+        set_limits(mmap_threshold=previous)
+
+
+@pytest.mark.parametrize("mmap_threshold", [0, 1024 * 1024])
+def test_bom_is_outside_the_buffer(tmp_path: Path, mmap_threshold: int) -> None:
+    path = tmp_path / "info.json"
+    path.write_bytes(codecs.BOM_UTF8 + b'{"name": "cog"}')
+    previous = cog_metadata.LIMITS.mmap_threshold
+    set_limits(mmap_threshold=mmap_threshold)
+    try:
+        metadata = load(str(path))
+        assert bytes(metadata.buffer) == b'{"name": "cog"}'
+        assert metadata.data == {"name": "cog"}
+    finally:
+        release(str(path))
+        set_limits(mmap_threshold=previous)
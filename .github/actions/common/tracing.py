@@ -0,0 +1,79 @@
+"""Lightweight spans for timing the phases of the CI scripts, exported in Chrome trace-event format"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+
+class Span:
+    __slots__ = ("args", "name", "start", "tracer")
+
+    def __init__(self, tracer: "Tracer", name: str, args: Dict[str, Any]) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.start = 0
+
+    def __enter__(self) -> "Span":
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.tracer.record(self.name, self.start, time.perf_counter_ns() - self.start, self.args)
+
+
+class NullSpan:
+    """Shared do-nothing span handed out while tracing is disabled, so a disabled span costs one call"""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "NullSpan":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        return None
+
+
+NULL_SPAN = NullSpan()
+
+
+class Tracer:
+    """Collects complete ("X") trace events; perf_counter is monotonic system-wide, so pool workers' events line up"""
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.events: List[Dict[str, Any]] = []
+
+    def span(self, name: str, **args: Any) -> Any:
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name, args)
+
+    def record(self, name: str, start_ns: int, duration_ns: int, args: Optional[Dict[str, Any]] = None) -> None:
+        self.events.append(
+            {
+                "name": name,
+                "ph": "X",
+                "ts": start_ns / 1000,
+                "dur": duration_ns / 1000,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": args or {},
+            }
+        )
+
+    def drain(self) -> List[Dict[str, Any]]:
+        """Returns and forgets the events recorded so far, for handing from a pool worker to the parent"""
+        events, self.events = self.events, []
+        return events
+
+    def write(self, path: str) -> None:
+        """Writes every event to a file that chrome://tracing or Perfetto can open"""
+        events = sorted(self.events, key=lambda event: event["ts"])
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+TRACER = Tracer()
@@ -0,0 +1,10 @@
+import os
+import sys
+
+# The CI scripts import their siblings by module name, as they do when run from their own directory
+ACTIONS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ACTIONS_DIR, "check-json"))
+sys.path.insert(0, os.path.join(ACTIONS_DIR, "setup"))
+sys.path.insert(0, os.path.join(ACTIONS_DIR, "common"))
+# The check-json stress cases live with the benchmarks
+sys.path.insert(0, os.path.join(ACTIONS_DIR, "..", "benchmarks"))
@@ -1,27 +1,318 @@
 """Pipeline script for extracting imports from cogs"""
+
+import argparse
+import hashlib
 import json
-from glob import glob
-from typing import Set
+import os
+import sys
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
 
+from packaging.requirements import InvalidRequirement, Requirement
+from packaging.utils import canonicalize_name
 
-def fetch_requirements() -> Set[str]:
-    requirements = set()
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+
+from atomic_write import write_atomic
+from cog_metadata import MetadataTooLarge, load_cogs, release
+from memprofile import MEMORY
+from metrics import METRICS
+from packaging.tags import platform_tags as native_platform_tags
+from poetry_lock import LOCK_PATH, LockError, base_requirements, closure, load_lock, requires_python, target_environment
+from profiling import profiled
+from wheels import describe, fallbacks, platform_environment, platform_tags, python_versions
+
+REQUIREMENTS_PATH = "requirements-cogs.txt"
+LOCKED_REQUIREMENTS_PATH = "requirements-locked.txt"
+BASE_REQUIREMENTS_PATH = "requirements.txt"
+CI_REQUIREMENTS_PATH = ".github/requirements-ci.txt"
+CACHE_KEY_HEADER = "# cache-key: "
+# Bumped whenever the digest's inputs or layout change, so old keys can never collide with new ones
+CACHE_KEY_VERSION = 1
+
+
+class RequirementConflict(Exception):
+    def __init__(self, name: str, entries: Tuple[str, str]) -> None:
+        super().__init__(f"Conflicting requirements for {name}: {entries[0]!r} and {entries[1]!r}")
+        self.entries = entries
+
+
+class InvalidMetadata(Exception):
+    pass
+
+
+def requirement_sources() -> Dict[str, List[str]]:
+    """Returns the cogs that declare each requirement.
+
+    Raises InvalidMetadata if a cog's info.json is not valid JSON, and MetadataTooLarge if it is over the size limit.
+    """
+    sources: Dict[str, List[str]] = {}
 
-    for filename in glob("*/info.json"):
-        with open(filename, "r") as fp:
-            info = json.load(fp)
+    for metadata in load_cogs():
+        try:
+            info = metadata.data
+        except json.JSONDecodeError as error:
+            raise InvalidMetadata(f"{metadata.path} is not valid JSON: {error}") from error
         if "requirements" in info:
-            requirements.update(info["requirements"])
+            for requirement in set(info["requirements"]):
+                sources.setdefault(requirement, []).append(os.path.dirname(metadata.path))
+        release(metadata.path)
+
+    return sources
+
+
+def count_requirements() -> "Counter[str]":
+    """Returns how many cogs declare each requirement"""
+    return Counter({requirement: len(cogs) for requirement, cogs in requirement_sources().items()})
+
+
+def fetch_requirements() -> Set[str]:
+    return set(count_requirements())
+
+
+def merge_requirements(requirements: Iterable[str]) -> List[str]:
+    """Returns one PEP 508 line per project and marker, with normalized names and merged extras and specifiers, sorted.
+
+    Entries that are not PEP 508 but that pip still installs, such as a bare `git+https://...` URL, follow verbatim,
+    sorted and deduplicated. Raises RequirementConflict if two entries pin one project to different URLs, or if one pins
+    it to a URL and another constrains its version, since a direct reference cannot also carry a specifier.
+    """
+    merged: Dict[Tuple[str, str], Requirement] = {}
+    # The entry each merged requirement first came from, to name both sides of a conflict
+    origins: Dict[Tuple[str, str], str] = {}
+    verbatim: Set[str] = set()
+    for line in requirements:
+        try:
+            requirement = Requirement(line)
+        except InvalidRequirement:
+            if line.strip():
+                verbatim.add(line.strip())
+            continue
+        requirement.name = canonicalize_name(requirement.name)
+        key = (requirement.name, str(requirement.marker or ""))
+        existing = merged.get(key)
+        if existing is None:
+            merged[key] = requirement
+            origins[key] = line
+            continue
+        differing_urls = requirement.url and existing.url and requirement.url != existing.url
+        if differing_urls or ((requirement.url or existing.url) and (requirement.specifier or existing.specifier)):
+            raise RequirementConflict(requirement.name, (origins[key], line))
+        existing.url = existing.url or requirement.url
+        existing.extras |= requirement.extras
+        existing.specifier &= requirement.specifier
+    return [*(str(merged[key]) for key in sorted(merged)), *sorted(verbatim)]
+
+
+def default_python_version() -> str:
+    return f"{sys.version_info.major}.{sys.version_info.minor}"
+
+
+def cache_key(requirements: List[str], python_version: str) -> str:
+    """Returns a digest of everything that decides what gets installed, given the merged cog requirements"""
+    digest = hashlib.sha256()
+
+    def update(label: str, data: bytes) -> None:
+        # Length-prefixed so no two different sets of inputs can produce the same byte stream
+        digest.update(f"{label} {len(data)}\n".encode())
+        digest.update(data)
+
+    update("version", str(CACHE_KEY_VERSION).encode())
+    update("python", python_version.encode())
+    for path in (BASE_REQUIREMENTS_PATH, CI_REQUIREMENTS_PATH):
+        try:
+            with open(path, "rb") as f:
+                update(path, f.read())
+        except FileNotFoundError:
+            update(f"{path} (missing)", b"")
+    update("cogs", "\n".join(requirements).encode())
+    return f"sha256:{digest.hexdigest()}"
+
+
+def read_cache_key(path: str = REQUIREMENTS_PATH) -> Optional[str]:
+    """Returns the cache key recorded in the header of a compiled requirements file"""
+    try:
+        with open(path, "r") as f:
+            first_line = f.readline()
+    except FileNotFoundError:
+        return None
+    if first_line.startswith(CACHE_KEY_HEADER):
+        return first_line[len(CACHE_KEY_HEADER) :].strip()
+    return None
+
+
+def write_requirements(requirements: Set[str], python_version: str, path: str = REQUIREMENTS_PATH) -> bool:
+    """Writes the merged requirements under a cache-key header, returning False if the key was unchanged"""
+    lines = merge_requirements(requirements)
+    key = cache_key(lines, python_version)
+    if read_cache_key(path) == key:
+        # Leave the file and its mtime alone so nothing downstream sees a change
+        return False
+    write_atomic(path, "".join(f"{line}\n" for line in [f"{CACHE_KEY_HEADER}{key}", *lines]))
+    return True
+
+
+def export_lock(requirements: Iterable[str], python_version: str, lock_path: str = LOCK_PATH) -> Tuple[List[str], List[str]]:
+    """Returns hash-pinned lines for the locked closure of the requirements, and the packages that cannot carry hashes"""
+    packages = closure(load_lock(lock_path), requirements, target_environment(python_version))
+    pinned = []
+    unhashable = []
+    for name in sorted(packages):
+        package = packages[name]
+        if package.url or not package.files:
+            unhashable.append(f"{name} @ {package.url}" if package.url else f"{name}=={package.version}")
+            continue
+        hashes = sorted({digest for _, digest in package.files})
+        pinned.append(" \\\n".join([f"{name}=={package.version}", *(f"    --hash={digest}" for digest in hashes)]))
+    return pinned, unhashable
+
+
+def write_locked_requirements(args: argparse.Namespace) -> int:
+    try:
+        pinned, unhashable = export_lock(
+            [*base_requirements(), *merge_requirements(fetch_requirements())], args.python, args.lock
+        )
+    except LockError as error:
+        print(f"Cannot export {args.lock}: {error}", file=sys.stderr)
+        return 1
+    lines = [
+        f"# Generated by compile_requirements.py export-lock from {args.lock} for Python {args.python}.",
+        "# Install with: pip install --no-deps --require-hashes --requirement " + args.output,
+        *pinned,
+    ]
+    if unhashable:
+        # pip refuses unhashed requirements in hash-checking mode, so these have to be installed separately
+        lines.append("# Not hash-pinnable, install separately:")
+        lines.extend(f"#   {requirement}" for requirement in unhashable)
+        print(f"Warning: {len(unhashable)} locked package(s) have no hashes: {', '.join(unhashable)}", file=sys.stderr)
+    write_atomic(args.output, "".join(f"{line}\n" for line in lines))
+    print(f"Exported {len(pinned)} pinned requirement(s) to {args.output}")
+    return 0
+
+
+def check_wheels(args: argparse.Namespace) -> int:
+    """Reports every locked requirement pip would have to build from source, for each target Python version"""
+    platforms = platform_tags(args.platform) if args.platform else list(native_platform_tags())
+    platform_markers = platform_environment(args.platform) if args.platform else {}
+    label = args.platform or "this platform"
+    try:
+        versions = args.python_versions or python_versions(requires_python())
+        packages = load_lock(args.lock)
+        requirements = [*base_requirements(), *merge_requirements(fetch_requirements())]
+        kinds: "Counter[str]" = Counter()
+        for version in versions:
+            environment = {**target_environment(version), **platform_markers}
+            for fallback in fallbacks(closure(packages, requirements, environment), version, platforms):
+                kinds[fallback.kind] += 1
+                print(describe(fallback, label))
+    except LockError as error:
+        print(f"Cannot check {args.lock}: {error}", file=sys.stderr)
+        return 1
+    print(
+        f"Checked Python {', '.join(versions)} on {label}: {kinds['sdist']} requirement(s) would build from an sdist,"
+        f" {kinds['missing']} have no distribution at all"
+    )
+    return int(bool(kinds["sdist"] or kinds["missing"]))
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compiles the requirements of every cog into requirements-cogs.txt")
+    commands = parser.add_subparsers(dest="command")
+    cache_key_parser = commands.add_parser(
+        "cache-key", help="print a digest of the cog, CI and base requirements and the Python version, for keying caches"
+    )
+    export_parser = commands.add_parser(
+        "export-lock",
+        help="write the poetry.lock closure of the base and cog requirements as exact pins with --hash lines",
+    )
+    export_parser.add_argument("--lock", default=LOCK_PATH, help=f"lock file to export from (default: {LOCK_PATH})")
+    export_parser.add_argument(
+        "--output", default=LOCKED_REQUIREMENTS_PATH, help=f"where to write (default: {LOCKED_REQUIREMENTS_PATH})"
+    )
+    wheels_parser = commands.add_parser(
+        "wheels-check", help="report locked requirements with no wheel for the target Python versions and platform"
+    )
+    wheels_parser.add_argument("--lock", default=LOCK_PATH, help=f"lock file to check (default: {LOCK_PATH})")
+    wheels_parser.add_argument(
+        "--platform", metavar="TAG", help="platform tag such as manylinux_2_31_x86_64 or win_amd64 (default: this platform)"
+    )
+    wheels_parser.add_argument(
+        "--python-versions",
+        nargs="+",
+        metavar="X.Y",
+        help="Python versions to check (default: every version in pyproject.toml's requires-python)",
+    )
+    python_help = "target Python version for the cache key and lock markers (default: this interpreter's)"
+    parser.add_argument("--python", default=default_python_version(), metavar="X.Y", help=python_help)
+    # SUPPRESS keeps a subcommand from overwriting a --python given before it
+    for subparser in (cache_key_parser, export_parser):
+        subparser.add_argument("--python", default=argparse.SUPPRESS, metavar="X.Y", help=python_help)
+    parser.add_argument("--memprofile", metavar="PATH", help="trace allocations and write per-phase memory use as JSON")
+    parser.add_argument("--metrics-file", metavar="PATH", help="write requirement counts and durations as OpenMetrics text")
+    parser.add_argument(
+        "--profile", metavar="PATH", help="run under cProfile, writing pstats to PATH and collapsed stacks beside it"
+    )
+    args = parser.parse_args(argv)
+    if args.command is not None:
+        # Only compiling the requirements is instrumented, so refuse rather than silently write nothing
+        options = {"--memprofile": args.memprofile, "--metrics-file": args.metrics_file, "--profile": args.profile}
+        given = [option for option, value in options.items() if value is not None]
+        if given:
+            parser.error(f"{', '.join(given)} cannot be used with {args.command}, only when compiling the requirements")
+    return args
+
+
+def report_conflict(error: RequirementConflict) -> None:
+    print(f"Cannot merge the cog requirements: {error}", file=sys.stderr)
+    sources = requirement_sources()
+    for entry in error.entries:
+        print(f"  {entry!r} is required by {', '.join(sorted(sources.get(entry, ['an unknown cog'])))}", file=sys.stderr)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    try:
+        return run_command(args)
+    except RequirementConflict as error:
+        report_conflict(error)
+        return 1
+    except (InvalidMetadata, MetadataTooLarge) as error:
+        print(f"Cannot read the cog requirements: {error}", file=sys.stderr)
+        return 1
+
 
-    return requirements
+def run_command(args: argparse.Namespace) -> int:
+    if args.command == "cache-key":
+        print(cache_key(merge_requirements(fetch_requirements()), args.python))
+        return 0
+    if args.command == "export-lock":
+        return write_locked_requirements(args)
+    if args.command == "wheels-check":
+        return check_wheels(args)
+    if args.profile is not None:
+        return profiled(args.profile, run, args)
+    return run(args)
 
 
-def write_requirements(requirements: Set[str]):
-    with open("requirements-cogs.txt", "a") as fp:
-        fp.write("\n".join(requirements))
+def run(args: argparse.Namespace) -> int:
+    if args.memprofile is not None:
+        MEMORY.start()
+    if args.metrics_file is not None:
+        METRICS.start("tig_cogs_compile_requirements")
+    with MEMORY.phase("fetch requirements"), METRICS.phase("fetch requirements"):
+        counts = count_requirements()
+    with MEMORY.phase("write requirements"), METRICS.phase("write requirements"):
+        written = write_requirements(set(counts), args.python)
+    print("Compiled requirements" if written else "Requirements unchanged")
+    if args.memprofile is not None:
+        MEMORY.write(args.memprofile)
+    if args.metrics_file is not None:
+        METRICS.gauge("requirements", "Distinct requirement strings declared by cogs", len(counts))
+        for requirement, count in sorted(counts.items()):
+            METRICS.gauge("requirement_cogs", "Cogs declaring each requirement", count, requirement=requirement)
+        METRICS.write(args.metrics_file)
+    return 0
 
 
 if __name__ == "__main__":
-    all_requirements = fetch_requirements()
-    write_requirements(all_requirements)
-    print("Compiled requirements")
+    raise SystemExit(main())
@@ -0,0 +1,245 @@
+"""Compact, cached view of poetry.lock and the pinned dependency closure of a set of requirements"""
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from atomic_write import write_atomic
+from packaging.markers import Marker, default_environment
+from packaging.requirements import InvalidRequirement, Requirement
+from packaging.utils import canonicalize_name
+from pyproject import PYPROJECT_PATH, tomllib
+
+LOCK_PATH = "poetry.lock"
+LOCK_CACHE_PATH = ".cache/poetry-lock.json"
+# Bumped whenever the compact layout changes, so an older cache is rebuilt rather than misread
+LOCK_CACHE_VERSION = 1
+
+
+class Dependency(NamedTuple):
+    name: str
+    marker: str
+    optional: bool
+    extras: Tuple[str, ...]
+
+
+class LockedPackage(NamedTuple):
+    name: str
+    version: str
+    python_versions: str
+    # (filename, "sha256:...") for every wheel and sdist poetry recorded
+    files: Tuple[Tuple[str, str], ...]
+    dependencies: Tuple[Dependency, ...]
+    extras: Dict[str, Tuple[str, ...]]
+    # "git+<url>@<commit>" style direct reference for packages that are not on an index
+    url: str
+
+
+class LockError(Exception):
+    pass
+
+
+def parse_dependencies(table: Dict[str, Any]) -> Tuple[Dependency, ...]:
+    dependencies = []
+    for name, spec in table.items():
+        # A dependency is a version string, a table, or a list of tables that differ by marker
+        for entry in spec if isinstance(spec, list) else [spec]:
+            options = entry if isinstance(entry, dict) else {}
+            dependencies.append(
+                Dependency(
+                    canonicalize_name(name),
+                    options.get("markers", ""),
+                    bool(options.get("optional")),
+                    tuple(options.get("extras", ())),
+                )
+            )
+    return tuple(dependencies)
+
+
+def parse_lock(raw: bytes) -> Dict[str, LockedPackage]:
+    """Returns the packages of a poetry.lock, keyed by normalized name"""
+    if tomllib is None:
+        raise LockError("reading poetry.lock needs tomli on Python < 3.11")
+    packages: Dict[str, LockedPackage] = {}
+    for package in tomllib.loads(raw.decode("utf-8")).get("package", []):
+        source = package.get("source", {})
+        url = f"{source['type']}+{source['url']}@{source['resolved_reference']}" if source.get("type") == "git" else ""
+        name = canonicalize_name(package["name"])
+        packages[name] = LockedPackage(
+            name=name,
+            version=package["version"],
+            python_versions=package.get("python-versions", "*"),
+            files=tuple((file["file"], file["hash"]) for file in package.get("files", [])),
+            dependencies=parse_dependencies(package.get("dependencies", {})),
+            extras={extra: tuple(requirements) for extra, requirements in package.get("extras", {}).items()},
+            url=url,
+        )
+    return packages
+
+
+def encode(packages: Dict[str, LockedPackage]) -> List[Any]:
+    return [[*package[:3], package.files, package.dependencies, package.extras, package.url] for package in packages.values()]
+
+
+def decode(rows: List[Any]) -> Dict[str, LockedPackage]:
+    packages = {}
+    for name, version, python_versions, files, dependencies, extras, url in rows:
+        packages[name] = LockedPackage(
+            name,
+            version,
+            python_versions,
+            tuple((filename, digest) for filename, digest in files),
+            tuple(Dependency(dep[0], dep[1], dep[2], tuple(dep[3])) for dep in dependencies),
+            {extra: tuple(requirements) for extra, requirements in extras.items()},
+            url,
+        )
+    return packages
+
+
+def load_lock(path: str = LOCK_PATH, cache_path: Optional[str] = LOCK_CACHE_PATH) -> Dict[str, LockedPackage]:
+    """Returns the parsed lock, from the compact cache when it was built from a lock file with the same hash"""
+    with open(path, "rb") as f:
+        raw = f.read()
+    lock_hash = hashlib.sha256(raw).hexdigest()
+    if cache_path is not None:
+        try:
+            with open(cache_path, "r") as f:
+                cached = json.load(f)
+            if cached["version"] == LOCK_CACHE_VERSION and cached["lock_sha256"] == lock_hash:
+                return decode(cached["packages"])
+        except (FileNotFoundError, ValueError, KeyError, TypeError):
+            pass
+    packages = parse_lock(raw)
+    if cache_path is not None:
+        os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+        document = {"version": LOCK_CACHE_VERSION, "lock_sha256": lock_hash, "packages": encode(packages)}
+        write_atomic(cache_path, json.dumps(document, separators=(",", ":")))
+    return packages
+
+
+def base_requirements(path: str = PYPROJECT_PATH) -> List[str]:
+    """Returns the main [tool.poetry.dependencies] of pyproject.toml by name (the lock decides the versions)"""
+    if tomllib is None:
+        raise LockError("reading pyproject.toml needs tomli on Python < 3.11")
+    with open(path, "rb") as f:
+        dependencies = tomllib.load(f).get("tool", {}).get("poetry", {}).get("dependencies", {})
+    requirements = []
+    for name, spec in dependencies.items():
+        if name == "python":
+            continue
+        extras = spec.get("extras", []) if isinstance(spec, dict) else []
+        requirements.append(f"{name}[{','.join(extras)}]" if extras else name)
+    return requirements
+
+
+def requires_python(path: str = PYPROJECT_PATH) -> str:
+    """Returns the [project] requires-python range of pyproject.toml"""
+    if tomllib is None:
+        raise LockError("reading pyproject.toml needs tomli on Python < 3.11")
+    with open(path, "rb") as f:
+        requires: Optional[str] = tomllib.load(f).get("project", {}).get("requires-python")
+    if not requires:
+        raise LockError(f"{path} does not declare [project] requires-python")
+    return requires
+
+
+def target_environment(python_version: str) -> Dict[str, str]:
+    """Returns the marker environment of this platform with the Python version swapped for the target's"""
+    environment = {key: str(value) for key, value in default_environment().items()}
+    if environment["python_version"] != python_version:
+        environment["python_version"] = python_version
+        environment["python_full_version"] = f"{python_version}.0"
+    return environment
+
+
+def applies(marker: str, environment: Dict[str, str], extras: Iterable[str]) -> bool:
+    if not marker:
+        return True
+    parsed = Marker(marker)
+    return any(parsed.evaluate({**environment, "extra": extra}) for extra in ("", *extras))
+
+
+def strip_reference(url: str) -> str:
+    """Returns a direct-reference URL without its fragment, revision or `.git` suffix, for comparing sources"""
+    scheme, separator, rest = url.split("#", 1)[0].partition("://")
+    host, slash, path = rest.partition("/")
+    # An "@" in the host is user info; only one in the path marks a revision
+    stripped = f"{scheme}{separator}{host}{slash}{path.rsplit('@', 1)[0]}".rstrip("/")
+    return stripped[: -len(".git")] if stripped.endswith(".git") else stripped
+
+
+def locked_reference(packages: Dict[str, LockedPackage], url: str) -> Optional[LockedPackage]:
+    """Returns the locked package installed from a direct-reference URL such as `git+https://...`"""
+    source = strip_reference(url)
+    for package in packages.values():
+        if package.url and strip_reference(package.url) == source:
+            return package
+    return None
+
+
+def roots(
+    packages: Dict[str, LockedPackage], requirements: Iterable[str], environment: Dict[str, str]
+) -> List[Tuple[str, Tuple[str, ...]]]:
+    """Returns the locked name and requested extras of each requirement that applies to the target environment.
+
+    Raises LockError if a requirement is missing from the lock or the locked version does not satisfy it.
+    """
+    found: List[Tuple[str, Tuple[str, ...]]] = []
+    problems = []
+    for line in requirements:
+        try:
+            requirement = Requirement(line)
+        except InvalidRequirement:
+            # pip also takes bare URLs; poetry locks those as a direct reference under the project's name
+            package = locked_reference(packages, line)
+            if package is None:
+                problems.append(f"{line} is not a PEP 508 requirement or a direct reference in poetry.lock")
+            else:
+                found.append((package.name, ()))
+            continue
+        if requirement.marker is not None and not requirement.marker.evaluate(environment):
+            continue
+        project = canonicalize_name(requirement.name)
+        package = packages.get(project)
+        if package is None:
+            problems.append(f"{requirement} is not in poetry.lock")
+        elif not package.url and not requirement.specifier.contains(package.version, prereleases=True):
+            problems.append(f"{requirement} is not satisfied by the locked {project}=={package.version}")
+        else:
+            found.append((project, tuple(requirement.extras)))
+    if problems:
+        raise LockError("; ".join(problems))
+    return found
+
+
+def closure(
+    packages: Dict[str, LockedPackage], requirements: Iterable[str], environment: Dict[str, str]
+) -> Dict[str, LockedPackage]:
+    """Returns every locked package needed to install the requirements in the target environment.
+
+    Raises LockError if a requirement is missing from the lock or the locked version does not satisfy it.
+    """
+    needed: Dict[str, LockedPackage] = {}
+    requested: Dict[str, Set[str]] = {}
+    pending = roots(packages, requirements, environment)
+    while pending:
+        name, extras = pending.pop()
+        package = packages[name]
+        new_extras = set(extras) - requested.get(name, set())
+        if name in needed and not new_extras:
+            continue
+        needed[name] = package
+        requested.setdefault(name, set()).update(extras)
+        all_extras = requested[name]
+        extra_names = {
+            canonicalize_name(Requirement(extra_requirement).name)
+            for extra in all_extras
+            for extra_requirement in package.extras.get(extra, ())
+        }
+        for dependency in package.dependencies:
+            if dependency.optional and dependency.name not in extra_names:
+                continue
+            if dependency.name in packages and applies(dependency.marker, environment, all_extras):
+                pending.append((dependency.name, dependency.extras))
+    return needed
@@ -0,0 +1,58 @@
+import os
+
+import pytest
+from cog_metadata import LIMITS, clear_caches
+from compile_requirements import RequirementConflict, main, merge_requirements, parse_args
+
+CELTIC_TUNING = "git+https://github.com/tigattack/CelticTuning"
+
+
+def test_merges_pep_508_entries() -> None:
+    assert merge_requirements(["Requests>=2", "requests<3", "psutil", "requests[socks]"]) == [
+        "psutil",
+        "requests[socks]<3,>=2",
+    ]
+
+
+def test_passes_other_entries_through_verbatim() -> None:
+    assert merge_requirements([CELTIC_TUNING, "psutil", f" {CELTIC_TUNING}", ""]) == ["psutil", CELTIC_TUNING]
+
+
+def test_conflicting_urls_name_both_entries() -> None:
+    with pytest.raises(RequirementConflict) as error:
+        merge_requirements(["foo @ https://a.example/foo.whl", "Foo @ https://b.example/foo.whl"])
+    assert error.value.entries == ("foo @ https://a.example/foo.whl", "Foo @ https://b.example/foo.whl")
+
+
+def test_url_and_specifier_for_one_project_conflict() -> None:
+    with pytest.raises(RequirementConflict) as error:
+        merge_requirements(["foo @ https://x.example/foo.whl", "foo>=1"])
+    assert error.value.entries == ("foo @ https://x.example/foo.whl", "foo>=1")
+    assert merge_requirements(["foo[bar]", "foo @ https://x.example/foo.whl"]) == ["foo[bar] @ https://x.example/foo.whl"]
+
+
+@pytest.mark.parametrize(("content", "message"), [("{", "is not valid JSON"), ("[" + " " * 64 + "]", "byte limit")])
+def test_unreadable_cog_metadata_is_a_one_line_error(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: str, capsys: pytest.CaptureFixture[str], content: str, message: str
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(LIMITS, "max_file_size", 32)
+    os.mkdir("cog")
+    with open(os.path.join("cog", "info.json"), "w", encoding="utf-8") as f:
+        f.write(content)
+    clear_caches()
+    try:
+        assert main(["cache-key"]) == 1
+    finally:
+        clear_caches()
+    error = capsys.readouterr().err
+    assert error.startswith("Cannot read the cog requirements: cog/info.json") and message in error
+    assert error.count("\n") == 1
+
+
+@pytest.mark.parametrize("command", ["cache-key", "export-lock", "wheels-check"])
+def test_profiling_options_are_rejected_with_subcommands(capsys: pytest.CaptureFixture[str], command: str) -> None:
+    with pytest.raises(SystemExit):
+        parse_args(["--profile", "out.pstats", "--metrics-file", "metrics.txt", command])
+    assert "--metrics-file, --profile cannot be used with " + command in capsys.readouterr().err
+    assert parse_args(["--profile", "out.pstats"]).profile == "out.pstats"
@@ -0,0 +1,23 @@
+import pytest
+from poetry_lock import LockedPackage, LockError, closure, strip_reference
+
+CELTIC_TUNING = "git+https://github.com/tigattack/CelticTuning"
+
+
+@pytest.mark.parametrize(
+    "url",
+    [CELTIC_TUNING, f"{CELTIC_TUNING}.git", f"{CELTIC_TUNING}@15000ad", f"{CELTIC_TUNING}@main#egg=celtictuning"],
+)
+def test_strip_reference(url: str) -> None:
+    assert strip_reference(url) == CELTIC_TUNING
+
+
+def test_strip_reference_keeps_user_info() -> None:
+    assert strip_reference("git+ssh://git@github.com/a/b@v1") == "git+ssh://git@github.com/a/b"
+
+
+def test_closure_resolves_a_bare_url_to_its_locked_package() -> None:
+    package = LockedPackage("celtictuning", "1", ">=3.8", (), (), {}, f"{CELTIC_TUNING}@15000ad")
+    assert closure({"celtictuning": package}, [CELTIC_TUNING], {}) == {"celtictuning": package}
+    with pytest.raises(LockError, match="not a PEP 508 requirement"):
+        closure({"celtictuning": package}, ["git+https://example.com/other"], {})
@@ -0,0 +1,17 @@
+from wheels import platform_tags
+
+
+def test_musllinux_accepts_older_musl() -> None:
+    assert platform_tags("musllinux_1_2_x86_64") == [
+        "musllinux_1_2_x86_64",
+        "musllinux_1_1_x86_64",
+        "musllinux_1_0_x86_64",
+        "linux_x86_64",
+    ]
+
+
+def test_manylinux_alias_accepts_older_glibc_and_aliases() -> None:
+    tags = platform_tags("manylinux2014_aarch64")
+    assert tags[0] == "manylinux_2_17_aarch64"
+    assert {"manylinux_2_5_aarch64", "manylinux2014_aarch64", "manylinux2010_aarch64", "linux_aarch64"} <= set(tags)
+    assert not any(tag.startswith("musllinux") for tag in tags)
@@ -0,0 +1,117 @@
+"""Wheel tag matching of locked packages, to find what pip would have to build from source"""
+
+import re
+from typing import Dict, List, NamedTuple, Optional, Sequence, Set
+
+from packaging import tags
+from packaging.specifiers import SpecifierSet
+from packaging.utils import InvalidWheelFilename, parse_wheel_filename
+from poetry_lock import LockedPackage
+
+# The legacy manylinux names and the glibc version each stands for (PEP 600)
+MANYLINUX_ALIASES = {"manylinux2014": (2, 17), "manylinux2010": (2, 12), "manylinux1": (2, 5)}
+MANYLINUX_RE = re.compile(r"manylinux_(\d+)_(\d+)_(\w+)")
+MUSLLINUX_RE = re.compile(r"musllinux_(\d+)_(\d+)_(\w+)")
+MACOSX_RE = re.compile(r"macosx_(\d+)_(\d+)_(\w+)")
+# Newest minor version considered when expanding a requires-python range
+MAX_PYTHON_MINOR = 20
+
+
+class Fallback(NamedTuple):
+    python_version: str
+    name: str
+    version: str
+    # "sdist" when pip would build the sdist, "source" for direct references, "missing" when nothing installable is locked
+    kind: str
+
+
+def python_versions(requires_python: str) -> List[str]:
+    """Returns every 3.x minor version a requires-python range admits"""
+    specifier = SpecifierSet(requires_python)
+    return [f"3.{minor}" for minor in range(MAX_PYTHON_MINOR + 1) if specifier.contains(f"3.{minor}.0")]
+
+
+def platform_tags(platform: str) -> List[str]:
+    """Returns the platform tags an installer on this platform accepts, most specific first"""
+    for alias, glibc in MANYLINUX_ALIASES.items():
+        if platform.startswith(f"{alias}_"):
+            platform = f"manylinux_{glibc[0]}_{glibc[1]}_{platform[len(alias) + 1:]}"
+    manylinux = MANYLINUX_RE.fullmatch(platform)
+    if manylinux:
+        major, minor, arch = int(manylinux.group(1)), int(manylinux.group(2)), manylinux.group(3)
+        accepted = [f"manylinux_{major}_{glibc_minor}_{arch}" for glibc_minor in range(minor, -1, -1)]
+        accepted.extend(f"{alias}_{arch}" for alias, glibc in MANYLINUX_ALIASES.items() if glibc <= (major, minor))
+        return [*accepted, f"linux_{arch}"]
+    musllinux = MUSLLINUX_RE.fullmatch(platform)
+    if musllinux:
+        # Like glibc, a musl installer accepts wheels built against any older musl of the same major version (PEP 656)
+        major, minor, arch = int(musllinux.group(1)), int(musllinux.group(2)), musllinux.group(3)
+        return [*(f"musllinux_{major}_{musl_minor}_{arch}" for musl_minor in range(minor, -1, -1)), f"linux_{arch}"]
+    macosx = MACOSX_RE.fullmatch(platform)
+    if macosx:
+        return list(tags.mac_platforms((int(macosx.group(1)), int(macosx.group(2))), macosx.group(3)))
+    return [platform]
+
+
+def platform_environment(platform: str) -> Dict[str, str]:
+    """Returns the marker variables implied by a platform tag"""
+    if platform.startswith(("manylinux", "musllinux", "linux")):
+        arch = platform.split("_", 3)[-1] if platform.startswith(("manylinux_", "musllinux_")) else platform.split("_", 1)[1]
+        return {"sys_platform": "linux", "platform_system": "Linux", "os_name": "posix", "platform_machine": arch}
+    if platform.startswith("macosx"):
+        arch = platform.split("_", 3)[-1]
+        return {"sys_platform": "darwin", "platform_system": "Darwin", "os_name": "posix", "platform_machine": arch}
+    if platform.startswith("win"):
+        machine = {"win32": "x86", "win_amd64": "AMD64", "win_arm64": "ARM64"}.get(platform, platform)
+        return {"sys_platform": "win32", "platform_system": "Windows", "os_name": "nt", "platform_machine": machine}
+    return {}
+
+
+def supported_tags(python_version: str, platforms: Sequence[str]) -> Set[tags.Tag]:
+    """Returns every wheel tag CPython of the given version accepts on the given platforms"""
+    major, minor = (int(part) for part in python_version.split("."))
+    return {
+        *tags.cpython_tags((major, minor), platforms=platforms),
+        *tags.compatible_tags((major, minor), f"cp{major}{minor}", platforms),
+    }
+
+
+def has_wheel(package: LockedPackage, supported: Set[tags.Tag]) -> bool:
+    for filename, _ in package.files:
+        if not filename.endswith(".whl"):
+            continue
+        try:
+            wheel_tags = parse_wheel_filename(filename)[3]
+        except InvalidWheelFilename:
+            continue
+        if not wheel_tags.isdisjoint(supported):
+            return True
+    return False
+
+
+def fallbacks(packages: Dict[str, LockedPackage], python_version: str, platforms: Sequence[str]) -> List[Fallback]:
+    """Returns the packages that have no wheel matching the target interpreter and platform"""
+    supported = supported_tags(python_version, platforms)
+    found = []
+    for name in sorted(packages):
+        package = packages[name]
+        if package.url:
+            kind: Optional[str] = "source"
+        elif has_wheel(package, supported):
+            kind = None
+        elif any(not filename.endswith(".whl") for filename, _ in package.files):
+            kind = "sdist"
+        else:
+            kind = "missing"
+        if kind is not None:
+            found.append(Fallback(python_version, name, package.version, kind))
+    return found
+
+
+def describe(fallback: Fallback, platform: str) -> str:
+    target = f"Python {fallback.python_version} on {platform}"
+    if fallback.kind == "sdist":
+        return f"{fallback.name}=={fallback.version} has no wheel for {target} and would be built from its sdist"
+    if fallback.kind == "missing":
+        return f"{fallback.name}=={fallback.version} has no distribution for {target}"
+    return f"{fallback.name}=={fallback.version} is a direct reference and is always built from source"
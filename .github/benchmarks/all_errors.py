@@ -0,0 +1,74 @@
+"""Compares collecting every violation in one walk with re-running the compiled validator after each error"""
+
+import argparse
+import copy
+import json
+import sys
+import timeit
+from pathlib import Path
+from typing import Any, Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "actions" / "check-json"))
+
+import fastjsonschema
+from diagnostics import SchemaIndex, collect, document_path, enrich
+
+CHECK_JSON_DIR = Path(__file__).resolve().parent.parent / "actions" / "check-json"
+
+
+def make_document(violations: int) -> Dict[str, Any]:
+    """Returns a cog info.json with the given number of violations, spread across several rules"""
+    document: Dict[str, Any] = {"name": "bench", "author": [], "required_cogs": {}}
+    for i in range(violations):
+        kind = i % 3
+        if kind == 0:
+            document[f"unknown_{i}"] = i
+        elif kind == 1:
+            document["author"].append(i)
+        else:
+            document["required_cogs"][f"cog_{i}"] = "not a uri"
+    return document
+
+
+def repeated(validator: Any, index: SchemaIndex, document: Dict[str, Any]) -> int:
+    """Finds every violation the slow way: validate, drop the offending member, validate again"""
+    document = copy.deepcopy(document)
+    found = 0
+    while True:
+        try:
+            validator(document)
+            return found
+        except fastjsonschema.JsonSchemaValueException as error:
+            for diagnostic in enrich(error, document, index):
+                found += 1
+                parts = [part.replace("~1", "/").replace("~0", "~") for part in diagnostic.pointer.split("/")[1:]]
+                path = document_path(document, parts)
+                parent: Any = document
+                for part in path[:-1]:
+                    parent = parent[part]
+                del parent[path[-1]]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--violations", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--number", type=int, default=20, help="timed repetitions per measurement")
+    args = parser.parse_args()
+
+    schema = json.loads((CHECK_JSON_DIR / "cog.json").read_text())
+    validator = fastjsonschema.compile(copy.deepcopy(schema))
+    index = SchemaIndex(schema)
+    for violations in args.violations:
+        document = make_document(violations)
+        single = timeit.timeit(lambda: collect(document, index), number=args.number) / args.number
+        rerun = timeit.timeit(lambda: repeated(validator, index, document), number=args.number) / args.number
+        print(
+            f"{violations:>6} violations: single walk {single * 1e3:8.3f} ms"
+            f" ({len(collect(document, index))} found), repeated validator {rerun * 1e3:8.3f} ms"
+            f" ({repeated(validator, index, document)} found)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
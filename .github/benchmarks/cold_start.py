@@ -0,0 +1,53 @@
+"""Compares check-json cold-start time with pre-generated validators against runtime compilation"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+CHECK_JSON_DIR = Path(__file__).resolve().parent.parent / "actions" / "check-json"
+
+STARTUP_SNIPPET = """
+import sys
+sys.path.insert(0, {check_json_dir!r})
+import json_checker
+registry = json_checker.ValidatorRegistry(use_generated={use_generated})
+registry.get({repo!r})
+registry.get({cog!r})
+assert registry.generated == {expected_generated}, "the committed validators are stale, rerun build_validators.py"
+"""
+
+
+def time_cold_start(use_generated: bool, runs: int) -> List[float]:
+    """Returns the wall time of each fresh interpreter that loads both validators"""
+    snippet = STARTUP_SNIPPET.format(
+        check_json_dir=str(CHECK_JSON_DIR),
+        use_generated=use_generated,
+        repo=str(CHECK_JSON_DIR / "repo.json"),
+        cog=str(CHECK_JSON_DIR / "cog.json"),
+        expected_generated=2 if use_generated else 0,
+    )
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", snippet], check=True)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=20, help="interpreter launches per path")
+    args = parser.parse_args()
+
+    for label, use_generated in (("runtime compile", False), ("pre-generated", True)):
+        timings = time_cold_start(use_generated, args.runs)
+        print(f"{label:>16}: median {statistics.median(timings) * 1000:.1f} ms, min {min(timings) * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,134 @@
+"""Runs the benchmark suite and fails if any phase got slower than the committed baseline"""
+
+import argparse
+import json
+import math
+import os
+import statistics
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Sequence, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from run import DEFAULT_SIZES, PHASES, run_suite
+
+DEFAULT_BASELINE = str(Path(__file__).resolve().parent / "baseline.json")
+CONFIDENCE = 0.95
+
+
+def median_ci(values: Sequence[float], confidence: float = CONFIDENCE) -> Tuple[float, float]:
+    """Returns a distribution-free confidence interval for the median, from the order statistics of the runs"""
+    ordered = sorted(values)
+    n = len(ordered)
+    # Widen [j, n - 1 - j] symmetrically until the binomial coverage of the median reaches the confidence level
+    for j in range(n // 2, -1, -1):
+        coverage = sum(math.comb(n, i) for i in range(j + 1, n - j)) / 2**n
+        if coverage >= confidence:
+            return ordered[j], ordered[n - 1 - j]
+    return ordered[0], ordered[-1]
+
+
+class Comparison(NamedTuple):
+    cogs: int
+    phase: str
+    baseline: float
+    current: float
+    baseline_ci: Tuple[float, float]
+    current_ci: Tuple[float, float]
+    regressed: bool
+
+    @property
+    def delta(self) -> float:
+        return (self.current - self.baseline) / self.baseline if self.baseline else 0.0
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], phases: Sequence[str], threshold: float) -> List[Comparison]:
+    """Compares matching sizes and phases.
+
+    A phase regresses when its median is more than `threshold` slower than the baseline median and the two confidence
+    intervals do not overlap, so noise between runs alone does not fail the gate.
+    """
+    baseline_sizes = {result["cogs"]: result for result in baseline["results"]}
+    comparisons = []
+    for result in current["results"]:
+        base = baseline_sizes.get(result["cogs"])
+        if base is None:
+            continue
+        for phase in phases:
+            if phase not in base["phases"] or phase not in result["phases"]:
+                continue
+            base_runs, runs = base["phases"][phase]["runs"], result["phases"][phase]["runs"]
+            base_median, median = statistics.median(base_runs), statistics.median(runs)
+            base_ci, ci = median_ci(base_runs), median_ci(runs)
+            regressed = median > base_median * (1 + threshold) and ci[0] > base_ci[1]
+            comparisons.append(Comparison(result["cogs"], phase, base_median, median, base_ci, ci, regressed))
+    return comparisons
+
+
+def format_table(comparisons: Sequence[Comparison]) -> str:
+    """Returns a Markdown per-phase delta table, suitable for a GitHub step summary"""
+
+    def ms(seconds: float) -> str:
+        return f"{seconds * 1e3:.2f}"
+
+    lines = [
+        "| Cogs | Phase | Baseline ms (95% CI) | Current ms (95% CI) | Delta | Status |",
+        "| ---: | :---- | :------------------- | :------------------ | ----: | :----- |",
+    ]
+    for c in comparisons:
+        lines.append(
+            f"| {c.cogs} | {c.phase} | {ms(c.baseline)} [{ms(c.baseline_ci[0])}, {ms(c.baseline_ci[1])}]"
+            f" | {ms(c.current)} [{ms(c.current_ci[0])}, {ms(c.current_ci[1])}] | {c.delta:+.1%}"
+            f" | {'regressed' if c.regressed else 'ok'} |"
+        )
+    return "\n".join(lines)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="committed baseline results")
+    parser.add_argument("--results", help="compare these results instead of running the suite")
+    parser.add_argument("--update-baseline", action="store_true", help="run the suite and overwrite the baseline")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown as a fraction (default: 0.10)")
+    parser.add_argument("--phases", nargs="+", default=list(PHASES), choices=PHASES, help="phases to gate on")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="cog directory counts")
+    parser.add_argument("--repeat", type=int, default=10, help="timed runs per size")
+    parser.add_argument("--workdir", default="", help="keep generated repos here and reuse them across runs")
+    args = parser.parse_args()
+
+    if args.results:
+        with open(args.results, "r") as f:
+            current = json.load(f)
+    else:
+        current = run_suite(args.sizes, args.repeat, args.workdir)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(current, f, indent=2)
+        print(f"Updated {args.baseline}")
+        return 0
+
+    try:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        print(f"No baseline at {args.baseline}; create one with --update-baseline", file=sys.stderr)
+        return 2
+
+    comparisons = compare(baseline, current, args.phases, args.threshold)
+    table = format_table(comparisons)
+    print(table)
+    summary_path = os.environ.get("GITHUB_STEP_SUMMARY")
+    if summary_path:
+        with open(summary_path, "a") as f:
+            f.write(f"## Benchmark comparison\n\n{table}\n")
+
+    regressions = [c for c in comparisons if c.regressed]
+    if regressions:
+        print(f"{len(regressions)} phase(s) regressed by more than {args.threshold:.0%}", file=sys.stderr)
+    return int(bool(regressions))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,153 @@
+"""Times each phase of check-json and compile_requirements against synthetic repos of increasing size"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "actions" / "check-json"))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "actions" / "setup"))
+
+import fastjsonschema
+import json_checker
+from cog_metadata import Metadata, clear_caches, load
+from compile_requirements import fetch_requirements
+from diagnostics import collect
+from json_positions import index_positions
+from routing import SchemaRouter
+from synthetic_repo import generate
+
+ACTIONS_DIR = Path(__file__).resolve().parent.parent / "actions"
+DEFAULT_SIZES = (10, 1_000, 10_000, 100_000)
+PHASES = ("discovery", "parsing", "validation", "error_location", "requirements")
+ROUTES = {
+    "info.json": str(ACTIONS_DIR / "check-json" / "repo.json"),
+    "*/info.json": str(ACTIONS_DIR / "check-json" / "cog.json"),
+}
+
+
+class Timer:
+    def __init__(self) -> None:
+        self.timings: Dict[str, float] = {}
+
+    def phase(self, name: str, func: Callable[[], Any]) -> Any:
+        start = time.perf_counter()
+        result = func()
+        self.timings[name] = time.perf_counter() - start
+        return result
+
+
+def run_once(router: SchemaRouter) -> Tuple[Dict[str, float], int]:
+    """Runs every phase once from cold caches, returning the phase timings and the number of invalid files"""
+    clear_caches()
+    timer = Timer()
+    tasks: List[Tuple[str, str]] = timer.phase("discovery", router.discover)
+
+    def parse() -> List[Tuple[str, Metadata]]:
+        loaded = [(schema_path, load(filename)) for schema_path, filename in tasks]
+        for _, metadata in loaded:
+            metadata.parse()
+        return loaded
+
+    loaded = timer.phase("parsing", parse)
+
+    def validate() -> List[Tuple[str, Metadata]]:
+        failed = []
+        for schema_path, metadata in loaded:
+            try:
+                json_checker.VALIDATORS.get(schema_path)(metadata.data)
+            except (fastjsonschema.JsonSchemaValueException, ValueError):
+                failed.append((schema_path, metadata))
+        return failed
+
+    failed = timer.phase("validation", validate)
+
+    def locate() -> None:
+        for schema_path, metadata in failed:
+            if metadata.error is not None:
+                continue
+            positions = index_positions(metadata.buffer)
+            for diagnostic in collect(metadata.data, json_checker.VALIDATORS.index(schema_path)):
+                positions.locate(diagnostic.pointer)
+
+    timer.phase("error_location", locate)
+
+    clear_caches()
+    timer.phase("requirements", fetch_requirements)
+    return timer.timings, len(failed)
+
+
+class chdir:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.previous = os.getcwd()
+
+    def __enter__(self) -> None:
+        os.chdir(self.path)
+
+    def __exit__(self, *exc: object) -> None:
+        os.chdir(self.previous)
+
+
+def bench_size(workdir: str, cogs: int, repeat: int) -> Dict[str, Any]:
+    root = os.path.join(workdir, f"repo-{cogs}")
+    if not os.path.exists(os.path.join(root, "info.json")):
+        generate(root, cogs)
+    router = SchemaRouter(ROUTES)
+    runs: Dict[str, List[float]] = {phase: [] for phase in PHASES}
+    invalid = 0
+    with chdir(root):
+        for _ in range(repeat):
+            timings, invalid = run_once(router)
+            for phase, seconds in timings.items():
+                runs[phase].append(seconds)
+    return {
+        "cogs": cogs,
+        "invalid": invalid,
+        "phases": {phase: {"median": statistics.median(values), "runs": values} for phase, values in runs.items()},
+    }
+
+
+def iter_results(workdir: str, sizes: Sequence[int], repeat: int) -> Iterator[Dict[str, Any]]:
+    for cogs in sizes:
+        result = bench_size(workdir, cogs, repeat)
+        medians = ", ".join(f"{phase} {data['median'] * 1e3:.1f} ms" for phase, data in result["phases"].items())
+        print(f"{cogs:>7} cogs ({result['invalid']} invalid): {medians}", file=sys.stderr)
+        yield result
+
+
+def run_suite(sizes: Sequence[int], repeat: int, workdir: str = "") -> Dict[str, Any]:
+    """Runs the suite and returns the machine-readable results"""
+    meta = {"python": platform.python_version(), "platform": platform.platform(), "repeat": repeat}
+    if workdir:
+        return {"meta": meta, "results": list(iter_results(workdir, sizes, repeat))}
+    with tempfile.TemporaryDirectory(prefix="tig-cogs-bench-") as tmp:
+        return {"meta": meta, "results": list(iter_results(tmp, sizes, repeat))}
+
+
+def parse_args(argv: Sequence[str] = ()) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="cog directory counts")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per size")
+    parser.add_argument("--workdir", default="", help="keep generated repos here and reuse them across runs")
+    parser.add_argument("--output", default="benchmark-results.json", help="where to write the JSON results")
+    return parser.parse_args(argv or None)
+
+
+def main() -> int:
+    args = parse_args()
+    results = run_suite(args.sizes, args.repeat, args.workdir)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Wrote {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,140 @@
+"""Worst-case latency checks for error location on adversarial info.json files.
+
+Each case is generated at two sizes from a seeded RNG. The checker must handle every file within a per-file latency
+bound, must scale roughly linearly between the two sizes, and every reported position must point at the key it names.
+"""
+
+import argparse
+import json
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "actions" / "check-json"))
+
+import json_checker
+from cog_metadata import clear_caches, set_limits
+from json_positions import index_positions, to_pointer
+
+COG_SCHEMA = str(Path(__file__).resolve().parent.parent / "actions" / "check-json" / "cog.json")
+METACHARACTERS = '.*+?()[]{}|^$\\"/~'
+# A 2x larger input may take at most this many times longer before the case counts as super-linear
+MAX_SCALING = 3.5
+# Below this many seconds timer noise dominates, so scaling is not judged
+MIN_SCALING_SECONDS = 0.05
+
+
+def random_key(rng: random.Random, length: int) -> str:
+    alphabet = string.ascii_letters + METACHARACTERS + "é✓"
+    return "".join(rng.choice(alphabet) for _ in range(length))
+
+
+def long_single_line(rng: random.Random, size: int) -> Dict[str, Any]:
+    return {"name": "x", "description": "y" * size, **{f"bad{i}": i for i in range(10)}}
+
+
+def many_keys(rng: random.Random, size: int) -> Dict[str, Any]:
+    return {f"unexpected_{i}": i for i in range(size // 20)}
+
+
+def metacharacter_keys(rng: random.Random, size: int) -> Dict[str, Any]:
+    return {random_key(rng, rng.randint(1, 40)): rng.randint(0, 9) for _ in range(size // 40)}
+
+
+def nested_required_cogs(rng: random.Random, size: int) -> Dict[str, Any]:
+    depth = min(size // 1000, 400)
+    nested: Any = "https://example.com/repo"
+    for level in range(depth):
+        nested = {f"cog{level}": nested}
+    return {"name": "x", "required_cogs": nested}
+
+
+def huge_strings(rng: random.Random, size: int) -> Dict[str, Any]:
+    escaped = '\\"' * (size // 4)
+    return {"name": "x", "short": escaped, "tags": ["a" * (size // 2), "a" * (size // 2)], "hidden": escaped}
+
+
+CASES: Dict[str, Callable[[random.Random, int], Dict[str, Any]]] = {
+    "long single line": long_single_line,
+    "many keys": many_keys,
+    "metacharacter keys": metacharacter_keys,
+    "nested required_cogs": nested_required_cogs,
+    "huge strings": huge_strings,
+}
+
+
+def check_positions(raw: bytes, document: Dict[str, Any]) -> None:
+    """Asserts that the index puts every top-level key exactly where its JSON string starts"""
+    positions = index_positions(raw)
+    lines = raw.decode("utf-8").split("\n")
+    for key in document:
+        line, col = positions.locate(to_pointer((key,)))
+        expected = json.dumps(key, ensure_ascii=False)
+        found = lines[line - 1][col - 1 : col - 1 + len(expected)]
+        assert found == expected, f"key {key!r} located at {line}:{col}, which holds {found!r}"
+
+
+def time_case(workdir: str, name: str, document: Dict[str, Any], indent: Optional[int]) -> float:
+    """Returns the seconds json_checker.validate took on the document, then checks the positions it would report"""
+    path = os.path.join(workdir, f"{name.replace(' ', '_')}.json")
+    with open(path, "w") as f:
+        json.dump(document, f, indent=indent, ensure_ascii=False)
+    clear_caches()
+    start = time.perf_counter()
+    json_checker.validate(COG_SCHEMA, path)
+    elapsed = time.perf_counter() - start
+    with open(path, "rb") as f:
+        check_positions(f.read(), document)
+    return elapsed
+
+
+def run_case(workdir: str, name: str, indent: Optional[int], args: argparse.Namespace) -> List[str]:
+    """Times one case at its base and doubled size, returning any violated bounds"""
+    failures = []
+    timings = []
+    for size in (args.size, args.size * 2):
+        document = CASES[name](random.Random(args.seed), size)
+        try:
+            elapsed = time_case(workdir, name, document, indent)
+        except AssertionError as error:
+            return [f"{name}: {error}"]
+        timings.append(elapsed)
+        if elapsed > args.max_seconds:
+            failures.append(f"{name} ({size} bytes): {elapsed:.3f}s exceeds {args.max_seconds}s")
+
+    small, large = timings
+    scaling = large / max(small, 1e-4)
+    layout = "one line" if indent is None else "indented"
+    print(f"{name:>22} ({layout:>8}): {small * 1e3:8.1f} ms -> {large * 1e3:8.1f} ms (x{scaling:.2f})")
+    if scaling > MAX_SCALING and large > MIN_SCALING_SECONDS:
+        failures.append(f"{name}: doubling the input scaled time by x{scaling:.2f}")
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=200_000, help="approximate bytes of the smaller input per case")
+    parser.add_argument("--max-seconds", type=float, default=2.0, help="per-file latency bound")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    set_limits(max_file_size=64 * args.size)
+    json_checker.VALIDATORS.get(COG_SCHEMA)
+    failures: List[str] = []
+    with tempfile.TemporaryDirectory(prefix="tig-cogs-stress-") as workdir:
+        for name in CASES:
+            for indent in (None, 2):
+                failures.extend(run_case(workdir, name, indent, args))
+
+    for failure in failures:
+        print(f"FAIL {failure}", file=sys.stderr)
+    return int(bool(failures))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
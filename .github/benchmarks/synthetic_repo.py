@@ -0,0 +1,80 @@
+"""Generates synthetic cog repositories for benchmarking the CI scripts"""
+
+import argparse
+import json
+import os
+import random
+from typing import Any, Dict, List
+
+REQUIREMENTS = ["pillow", "Pillow>=10", "python-dateutil", "python3-discogs-client", "requests>=2.31", "beautifulsoup4"]
+TAGS = ["utility", "fun", "moderation", "music", "api", "images", "cars", "tools"]
+INVALID_RATIO = 0.2
+
+
+def cog_info(rng: random.Random, i: int) -> Dict[str, Any]:
+    """Returns valid cog metadata with a varying number of keys and a varying amount of text"""
+    info: Dict[str, Any] = {
+        "name": f"Cog{i}",
+        "author": [f"author{rng.randrange(50)}" for _ in range(rng.randint(1, 3))],
+        "short": f"Synthetic cog {i}",
+    }
+    optional: Dict[str, Any] = {
+        "description": " ".join(["Lorem ipsum dolor sit amet."] * rng.choice([1, 5, 50, 500])),
+        "install_msg": f"Thanks for installing Cog{i}!",
+        "end_user_data_statement": "This cog does not store end user data.",
+        "min_bot_version": "3.5.0",
+        "min_python_version": [3, 9, 0],
+        "hidden": False,
+        "disabled": False,
+        "requirements": rng.sample(REQUIREMENTS, rng.randint(0, 3)),
+        "tags": rng.sample(TAGS, rng.randint(1, 4)),
+        "type": "COG",
+        "required_cogs": {f"dep{rng.randrange(10)}": "https://github.com/example/cogs"},
+    }
+    for key in rng.sample(sorted(optional), rng.randint(0, len(optional))):
+        info[key] = optional[key]
+    return info
+
+
+def break_info(rng: random.Random, info: Dict[str, Any]) -> None:
+    """Introduces one to three schema violations of different kinds"""
+    breakages: List[Dict[str, Any]] = [
+        {f"unexpected_{rng.randrange(1000)}": True},
+        {"hidden": "yes"},
+        {"min_bot_version": "three"},
+        {"tags": ["dup", "dup"]},
+        {"required_cogs": {"dep": "not a uri"}},
+        {"author": ["ok", 42]},
+    ]
+    for breakage in rng.sample(breakages, rng.randint(1, 3)):
+        info.update(breakage)
+
+
+def generate(root: str, cogs: int, seed: int = 0) -> None:
+    """Writes a repo info.json and `cogs` cog directories, roughly INVALID_RATIO of them invalid, below root"""
+    rng = random.Random(seed)
+    os.makedirs(root, exist_ok=True)
+    with open(os.path.join(root, "info.json"), "w") as f:
+        json.dump({"author": ["bench"], "short": "Synthetic repo", "install_msg": "Hi"}, f, indent=4)
+    for i in range(cogs):
+        info = cog_info(rng, i)
+        if rng.random() < INVALID_RATIO:
+            break_info(rng, info)
+        cog_dir = os.path.join(root, f"cog{i:06d}")
+        os.makedirs(cog_dir, exist_ok=True)
+        with open(os.path.join(cog_dir, "info.json"), "w") as f:
+            json.dump(info, f, indent=rng.choice([None, 2, 4]))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("root", help="directory to generate the repo in")
+    parser.add_argument("cogs", type=int, help="number of cog directories")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    generate(args.root, args.cogs, args.seed)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())